@@ -32,6 +32,8 @@ from . import __
 from . import exceptions as _exceptions
 
 
+# Requests close clients from custom factories after use. Clients from the
+# default factory are shared and closed by 'aclose_http_client'.
 HttpClientFactory: __.typx.TypeAlias = (
     __.cabc.Callable[ [ ], _httpx.AsyncClient ] )
 ContentResponse: __.typx.TypeAlias = _generics.Result[ bytes, Exception ]
@@ -39,6 +41,69 @@ ProbeResponse: __.typx.TypeAlias = _generics.Result[ bool, Exception ]
 RobotsResponse: __.typx.TypeAlias = (
     _generics.Result[ _RobotFileParser, Exception ] )
 
+_ResultT = __.typx.TypeVar( '_ResultT' )
+
+
+class _HttpClientHolder(
+    __.immut.Object, instances_mutables = ( 'client', 'loop' )
+):
+    ''' Holds HTTP client whose connection pool is reused by requests.
+
+        The client belongs to the event loop which was running when it
+        was produced. It stays open until explicitly closed or until a
+        client is produced for another loop. A replaced client is closed
+        on its own loop, if that loop is still running; otherwise its
+        connections cannot be closed gracefully and are left to garbage
+        collection along with the loop.
+    '''
+
+    def __init__( self ) -> None:
+        self.client: __.typx.Optional[ _httpx.AsyncClient ] = None
+        self.loop: __.typx.Optional[ __.asyncio.AbstractEventLoop ] = None
+
+    def produce( self ) -> _httpx.AsyncClient:
+        ''' Produces HTTP client for running loop, creating it if needed. '''
+        loop = __.asyncio.get_running_loop( )
+        client = self.client
+        if client is not None and not client.is_closed:
+            if self.loop is loop: return client
+            self._discard( client, self.loop )
+        client = self.client = _httpx.AsyncClient( limits = _http_limits )
+        self.loop = loop
+        return client
+
+    def owns( self, client: _httpx.AsyncClient ) -> bool:
+        ''' Does holder own HTTP client? '''
+        return client is self.client
+
+    async def aclose( self ) -> None:
+        ''' Closes held HTTP client and its pooled connections. '''
+        client = self.client
+        self.client = self.loop = None
+        if client is not None: await client.aclose( )
+
+    def _discard(
+        self,
+        client: _httpx.AsyncClient,
+        loop: __.typx.Optional[ __.asyncio.AbstractEventLoop ],
+    ) -> None:
+        ''' Closes replaced client on its loop, if still running. '''
+        if loop is None or loop.is_closed( ) or not loop.is_running( ):
+            return
+        __.asyncio.run_coroutine_threadsafe( client.aclose( ), loop )
+
+
+_http_limits = _httpx.Limits(
+    max_connections = 256,
+    max_keepalive_connections = 128,
+    keepalive_expiry = 30.0 )
+_http_client_holder = _HttpClientHolder( )
+
+
+def _produce_http_client( ) -> _httpx.AsyncClient:
+    ''' Produces HTTP client shared across requests on running loop. '''
+    return _http_client_holder.produce( )
+
 
 class CacheEntry( __.immut.DataclassObject ):
     ''' Cache entry base. '''
@@ -46,10 +111,9 @@ class CacheEntry( __.immut.DataclassObject ):
     timestamp: float
     ttl: float
 
-    @property
-    def invalid( self ) -> bool:
+    def invalid( self, current_time: float ) -> bool:
         ''' Checks if cache entry has exceeded its TTL. '''
-        return __.time.time( ) - self.timestamp > self.ttl
+        return current_time - self.timestamp > self.ttl
 
 
 class ContentCacheEntry( CacheEntry ):
@@ -58,6 +122,7 @@ class ContentCacheEntry( CacheEntry ):
     response: ContentResponse
     headers: _httpx.Headers
     size_bytes: int
+    charset: __.Absential[ str ] = __.absent
 
     @property
     def memory_usage( self ) -> int:
@@ -77,6 +142,43 @@ class RobotsCacheEntry( CacheEntry ):
     response: RobotsResponse
 
 
+class FrequencySketch(
+    __.immut.Object, instances_mutables = ( '_additions', )
+):
+    ''' Approximate request frequencies with periodic aging.
+
+        Counts are halved after each sample of additions, so that
+        popularity from long ago does not protect entries forever.
+    '''
+
+    sample_size: int = 10000
+
+    def __init__(
+        self, *, sample_size: __.Absential[ int ] = __.absent
+    ) -> None:
+        if not __.is_absent( sample_size ): self.sample_size = sample_size
+        self._counts: __.collections.Counter[ str ] = (
+            __.collections.Counter( ) )
+        self._additions = 0
+
+    def estimate( self, key: str ) -> int:
+        ''' Returns approximate request frequency for key. '''
+        return self._counts[ key ]
+
+    def increment( self, key: str ) -> None:
+        ''' Records request for key. '''
+        self._counts[ key ] += 1
+        self._additions += 1
+        if self._additions >= self.sample_size: self._age( )
+
+    def _age( self ) -> None:
+        ''' Halves all counts and forgets keys which decay to zero. '''
+        for key, count in tuple( self._counts.items( ) ):
+            if count > 1: self._counts[ key ] = count >> 1
+            else: del self._counts[ key ]
+        self._additions >>= 1
+
+
 class Cache( __.immut.Object ):
     ''' Cache base with shared configuration attributes. '''
 
@@ -89,22 +191,53 @@ class Cache( __.immut.Object ):
         success_ttl: __.Absential[ float ] = __.absent,
         delay_function: __.cabc.Callable[
             [ float ], __.cabc.Awaitable[ None ]
-        ] = __.asyncio.sleep
+        ] = __.asyncio.sleep,
+        time_function: __.cabc.Callable[ [ ], float ] = __.time.time,
     ) -> None:
         if not __.is_absent( error_ttl ): self.error_ttl = error_ttl
         if not __.is_absent( success_ttl ): self.success_ttl = success_ttl
         self.delay_function = delay_function
-        self._request_mutexes: dict[ str, __.asyncio.Lock ] = { }
+        self.time_function = time_function
+        self._requests_inflight: dict[
+            str,
+            __.asyncio.Future[ _generics.Result[ __.typx.Any, Exception ] ],
+        ] = { }
 
-    @__.ctxl.asynccontextmanager
-    async def acquire_mutex_for( self, url: str ):
-        ''' Acquires mutex for HTTP request deduplication. '''
-        if url not in self._request_mutexes: # pragma: no branch
-            self._request_mutexes[ url ] = __.asyncio.Lock( )
-        mutex = self._request_mutexes[ url ]
-        async with mutex:
-            try: yield
-            finally: self._request_mutexes.pop( url, None )
+    async def share_request(
+        self,
+        key: str,
+        requestor: __.cabc.Callable[ [ ], __.cabc.Awaitable[ _ResultT ] ],
+    ) -> _ResultT:
+        ''' Performs request once for all concurrent callers with key.
+
+            Callers which arrive while a request for the key is in
+            flight await its outcome instead of repeating the request.
+            If the request fails, each of them raises its own replica of
+            the failure, of the same type and chained from it. If the
+            request is cancelled, they perform it anew.
+        '''
+        while ( future := self._requests_inflight.get( key ) ) is not None:
+            try: outcome = await __.asyncio.shield( future )
+            except __.asyncio.CancelledError:
+                if not future.cancelled( ): raise # Caller was cancelled.
+                continue
+            match outcome:
+                case _generics.Value( value ): return value
+                case _generics.Error( error ):
+                    raise _replicate_exception( error ) from error
+        future = __.asyncio.get_running_loop( ).create_future( )
+        self._requests_inflight[ key ] = future
+        try: result = await requestor( )
+        except Exception as exc:
+            future.set_result( _generics.Error( exc ) )
+            raise
+        except BaseException:
+            future.cancel( )
+            raise
+        else:
+            future.set_result( _generics.Value( result ) )
+            return result
+        finally: del self._requests_inflight[ key ]
 
 
 class RobotsCache( Cache ):
@@ -129,7 +262,8 @@ class RobotsCache( Cache ):
             self.request_timeout = request_timeout
         if not __.is_absent( user_agent ): self.user_agent = user_agent
         self._cache: dict[ str, RobotsCacheEntry ] = { }
-        self._recency: __.collections.deque[ str ] = __.collections.deque( )
+        self._recency: __.collections.OrderedDict[ str, None ] = (
+            __.collections.OrderedDict( ) )
         self._request_delays: dict[ str, float ] = { }
 
     @classmethod
@@ -145,25 +279,26 @@ class RobotsCache( Cache ):
         self, client: _httpx.AsyncClient, domain: str, # TODO: retriever
     ) -> _RobotFileParser:
         ''' Retrieves cached robots.txt parser if valid. '''
-        if domain not in self._cache:
-            await _retrieve_robots_txt( client, self, domain )
-        entry = self._cache[ domain ]
-        if entry.invalid:
+        entry = self._cache.get( domain )
+        if entry is None or entry.invalid( self.time_function( ) ):
             self._remove( domain )
-            await _retrieve_robots_txt( client, self, domain )
+            await self.share_request(
+                domain, __.funct.partial(
+                    _retrieve_robots_txt, client, self, domain ) )
             entry = self._cache[ domain ]
         self._record_access( domain )
         return entry.response.extract( )
 
     def assign_delay( self, domain: str, delay_seconds: float ) -> None:
         ''' Sets next allowed request time for domain. '''
-        self._request_delays[ domain ] = __.time.time( ) + delay_seconds
+        self._request_delays[ domain ] = (
+            self.time_function( ) + delay_seconds )
 
     def calculate_delay_remainder( self, domain: str ) -> float:
         ''' Returns remaining crawl delay time for domain. '''
         allow_at = self._request_delays.get( domain, 0.0 )
         if not allow_at: return 0.0
-        remainder = allow_at - __.time.time( )
+        remainder = allow_at - self.time_function( )
         return max( 0.0, remainder )
 
     def determine_ttl( self, response: RobotsResponse ) -> float:
@@ -176,7 +311,8 @@ class RobotsCache( Cache ):
     ) -> None:
         ''' Stores robots.txt parser in cache. '''
         entry = RobotsCacheEntry(
-            response = response, timestamp = __.time.time( ), ttl = ttl )
+            response = response, timestamp = self.time_function( ),
+            ttl = ttl )
         self._cache[ domain ] = entry
         self._record_access( domain )
         self._evict_by_count( )
@@ -187,21 +323,19 @@ class RobotsCache( Cache ):
             len( self._cache ) > self.entries_max
             and self._recency
         ):
-            lru_domain = self._recency.popleft( )
+            lru_domain = self._recency.popitem( last = False )[ 0 ]
             if lru_domain in self._cache: # pragma: no branch
                 del self._cache[ lru_domain ]
 
     def _record_access( self, domain: str ) -> None:
         ''' Updates LRU access order for given domain. '''
-        with __.ctxl.suppress( ValueError ):
-            self._recency.remove( domain )
-        self._recency.append( domain )
+        self._recency[ domain ] = None
+        self._recency.move_to_end( domain )
 
     def _remove( self, domain: str ) -> None:
         ''' Removes entry from cache. '''
         self._cache.pop( domain, None )
-        with __.ctxl.suppress( ValueError ):
-            self._recency.remove( domain )
+        self._recency.pop( domain, None )
 
 
 class ContentCache( Cache, instances_mutables = ( '_memory_total', ) ):
@@ -221,8 +355,10 @@ class ContentCache( Cache, instances_mutables = ( '_memory_total', ) ):
         else: self.robots_cache = robots_cache
         if not __.is_absent( memory_max ): self.memory_max = memory_max
         self._cache: dict[ str, ContentCacheEntry ] = { }
+        self._frequencies = FrequencySketch( )
         self._memory_total = 0
-        self._recency: __.collections.deque[ str ] = __.collections.deque( )
+        self._recency: __.collections.OrderedDict[ str, None ] = (
+            __.collections.OrderedDict( ) )
 
     @classmethod
     def from_configuration(
@@ -248,12 +384,28 @@ class ContentCache( Cache, instances_mutables = ( '_memory_total', ) ):
         ''' Retrieves cached content if valid. '''
         if url not in self._cache: return __.absent
         entry = self._cache[ url ]
-        if entry.invalid:
+        if entry.invalid( self.time_function( ) ):
             self._remove( url )
             return __.absent
+        self._frequencies.increment( url )
         self._record_access( url )
         return ( entry.response.extract( ), entry.headers )
 
+    def access_charset( self, url: str ) -> __.Absential[ str ]:
+        ''' Retrieves charset recorded for cached textual content.
+
+            Empty charset means that none could be determined.
+        '''
+        entry = self._cache.get( url )
+        if entry is None: return __.absent
+        return entry.charset
+
+    def assign_charset( self, url: str, charset: str ) -> None:
+        ''' Records charset of cached content after textual validation. '''
+        entry = self._cache.get( url )
+        if entry is None: return
+        self._cache[ url ] = __.dcls.replace( entry, charset = charset )
+
     def determine_ttl( self, response: ContentResponse ) -> float:
         ''' Determines appropriate TTL based on response type. '''
         if response.is_value( ):
@@ -265,7 +417,7 @@ class ContentCache( Cache, instances_mutables = ( '_memory_total', ) ):
         self,
         url: _Url, /, *,
         duration_max: float = 30.0,
-        client_factory: HttpClientFactory = _httpx.AsyncClient,
+        client_factory: HttpClientFactory = _produce_http_client,
     ) -> bytes:
         ''' Convenience method for retrieving URL content. '''
         return await retrieve_url(
@@ -282,13 +434,14 @@ class ContentCache( Cache, instances_mutables = ( '_memory_total', ) ):
         entry = ContentCacheEntry(
             response = response,
             headers = headers,
-            timestamp = __.time.time( ),
+            timestamp = self.time_function( ),
             ttl = ttl,
             size_bytes = size_bytes )
         if old_entry := self._cache.get( url ):
             self._memory_total -= old_entry.memory_usage
         self._cache[ url ] = entry
         self._memory_total += entry.memory_usage
+        self._frequencies.increment( url )
         self._record_access( url )
         self._evict_by_memory( )
 
@@ -300,34 +453,49 @@ class ContentCache( Cache, instances_mutables = ( '_memory_total', ) ):
         return 100  # Conservative estimate for exception overhead
 
     def _evict_by_memory( self ) -> None:
-        ''' Evicts LRU entries until memory usage is under limit. '''
+        ''' Evicts LRU entries until memory usage is under limit.
+
+            The newest entry is evicted instead when the LRU entry has
+            been requested more often, so that one-off fetches do not
+            displace popular documents. Once the newest entry is gone,
+            eviction proceeds in plain LRU order.
+        '''
+        if not self._recency: return
+        newest_url = next( reversed( self._recency ) )
         while (
             self._memory_total > self.memory_max
             and self._recency
         ):
-            lru_url = self._recency.popleft( )
-            if lru_url in self._cache: # pragma: no branch
-                entry = self._cache[ lru_url ]
+            victim_url = next( iter( self._recency ) )
+            if newest_url in self._recency and (
+                self._frequencies.estimate( victim_url )
+                > self._frequencies.estimate( newest_url )
+            ): victim_url = newest_url
+            del self._recency[ victim_url ]
+            if victim_url in self._cache: # pragma: no branch
+                entry = self._cache[ victim_url ]
                 self._memory_total -= entry.memory_usage
-                del self._cache[ lru_url ]
-                _scribe.debug( f"Evicted cache entry: {lru_url}" )
+                del self._cache[ victim_url ]
+                _scribe.debug( f"Evicted cache entry: {victim_url}" )
 
     def _record_access( self, url: str ) -> None:
         ''' Updates LRU access order for given URL. '''
-        with __.ctxl.suppress( ValueError ):
-            self._recency.remove( url )
-        self._recency.append( url )
+        self._recency[ url ] = None
+        self._recency.move_to_end( url )
 
     def _remove( self, url: str ) -> None:
         ''' Removes entry from cache and updates memory tracking. '''
         if entry := self._cache.pop( url, None ):
             self._memory_total -= entry.memory_usage
-            with __.ctxl.suppress( ValueError ):
-                self._recency.remove( url )
+            self._recency.pop( url, None )
 
 
 class ProbeCache( Cache ):
-    ''' Cache manager for URL probe results (HEAD requests). '''
+    ''' Cache manager for URL probe results (HEAD requests).
+
+        Probe results are tiny, so entries are evicted in insertion
+        order rather than tracking recency on every access.
+    '''
 
     entries_max: int = 1000
 
@@ -343,7 +511,6 @@ class ProbeCache( Cache ):
         else: self.robots_cache = robots_cache
         if not __.is_absent( entries_max ): self.entries_max = entries_max
         self._cache: dict[ str, ProbeCacheEntry ] = { }
-        self._recency: __.collections.deque[ str ] = __.collections.deque( )
 
     @classmethod
     def from_configuration(
@@ -363,10 +530,9 @@ class ProbeCache( Cache ):
         ''' Retrieves cached probe result if valid. '''
         if url not in self._cache: return __.absent
         entry = self._cache[ url ]
-        if entry.invalid:
+        if entry.invalid( self.time_function( ) ):
             self._remove( url )
             return __.absent
-        self._record_access( url )
         return entry.response.extract( )
 
     def determine_ttl( self, response: ProbeResponse ) -> float:
@@ -380,7 +546,7 @@ class ProbeCache( Cache ):
         self,
         url: _Url, /, *,
         duration_max: float = 10.0,
-        client_factory: HttpClientFactory = _httpx.AsyncClient,
+        client_factory: HttpClientFactory = _produce_http_client,
     ) -> bool:
         ''' Convenience method for probing URL existence. '''
         return await probe_url(
@@ -394,41 +560,39 @@ class ProbeCache( Cache ):
         ''' Stores probe result in cache. '''
         entry = ProbeCacheEntry(
             response = response,
-            timestamp = __.time.time( ),
+            timestamp = self.time_function( ),
             ttl = ttl )
+        self._cache.pop( url, None ) # Reinsert as newest.
         self._cache[ url ] = entry
-        self._record_access( url )
         self._evict_by_count( )
 
     def _evict_by_count( self ) -> None:
         ''' Evicts oldest entries when cache exceeds max size. '''
-        while (
-            len( self._cache ) > self.entries_max
-            and self._recency
-        ):
-            lru_url = self._recency.popleft( )
-            if lru_url in self._cache: # pragma: no branch
-                del self._cache[ lru_url ]
-
-    def _record_access( self, url: str ) -> None:
-        ''' Updates LRU access order for given URL. '''
-        with __.ctxl.suppress( ValueError ):
-            self._recency.remove( url )
-        self._recency.append( url )
+        while len( self._cache ) > self.entries_max:
+            del self._cache[ next( iter( self._cache ) ) ]
 
     def _remove( self, url: str ) -> None:
         ''' Removes entry from cache. '''
         self._cache.pop( url, None )
-        with __.ctxl.suppress( ValueError ):
-            self._recency.remove( url )
 
 
+_charset_regex = __.re.compile(
+    r''';\s*charset\s*=\s*["']?([^"';\s]+)''', __.re.IGNORECASE )
 _http_success_threshold = 400
 
 
 _scribe = __.acquire_scribe( __name__ )
 
 
+async def aclose_http_client( ) -> None:
+    ''' Closes HTTP client shared by default client factory.
+
+        Call on application teardown, while the event loop which produced
+        the client is still running. A later request produces a new one.
+    '''
+    await _http_client_holder.aclose( )
+
+
 def prepare(
     auxdata: __.Globals
 ) -> tuple[ ContentCache, ProbeCache, RobotsCache ]:
@@ -449,7 +613,7 @@ async def probe_url(
     cache: ProbeCache,
     url: _Url, *,
     duration_max: float = 10.0,
-    client_factory: HttpClientFactory = _httpx.AsyncClient,
+    client_factory: HttpClientFactory = _produce_http_client,
 ) -> bool:
     ''' Cached HEAD request to check URL existence. '''
     url_s = url.geturl( )
@@ -459,14 +623,11 @@ async def probe_url(
         case 'http' | 'https':
             result = await cache.access( url_s )
             if not __.is_absent( result ): return result
-            async with client_factory( ) as client:
-                result = await _probe_url(
-                    url, duration_max = duration_max,
-                    client = client,
-                    probe_cache = cache,
-                    robots_cache = cache.robots_cache )
-            ttl = cache.determine_ttl( result )
-            await cache.store( url_s, result, ttl )
+            result = await cache.share_request(
+                url_s, __.funct.partial(
+                    _probe_and_cache_url, cache, url,
+                    duration_max = duration_max,
+                    client_factory = client_factory ) )
             return result.extract( )
         case _: return False
 
@@ -475,14 +636,14 @@ async def retrieve_url(
     cache: ContentCache,
     url: _Url, *,
     duration_max: float = 30.0,
-    client_factory: HttpClientFactory = _httpx.AsyncClient,
+    client_factory: HttpClientFactory = _produce_http_client,
 ) -> bytes:
     ''' Cached GET request to fetch URL content as bytes. '''
     url_s = url.geturl( )
     match url.scheme:
         case '' | 'file':
             location = __.Path( url.path )
-            try: return location.read_bytes( )
+            try: return await __.asyncio.to_thread( location.read_bytes )
             except Exception as exc:
                 raise _exceptions.DocumentationInaccessibility(
                     url_s, exc ) from exc
@@ -491,15 +652,11 @@ async def retrieve_url(
             if not __.is_absent( result ):
                 content_bytes, _ = result
                 return content_bytes
-            async with client_factory( ) as client:
-                result, headers = await _retrieve_url(
-                    url,
+            result, _ = await cache.share_request(
+                url_s, __.funct.partial(
+                    _retrieve_and_cache_url, cache, url,
                     duration_max = duration_max,
-                    client = client,
-                    content_cache = cache,
-                    robots_cache = cache.robots_cache )
-            ttl = cache.determine_ttl( result )
-            await cache.store( url_s, result, headers, ttl )
+                    client_factory = client_factory ) )
             return result.extract( )
         case _:
             raise _exceptions.DocumentationInaccessibility(
@@ -511,14 +668,16 @@ async def retrieve_url_as_text(
     url: _Url, *,
     duration_max: float = 30.0,
     charset_default: str = 'utf-8',
-    client_factory: HttpClientFactory = _httpx.AsyncClient,
+    client_factory: HttpClientFactory = _produce_http_client,
 ) -> str:
     ''' Cached GET request to fetch URL content as text. '''
     url_s = url.geturl( )
     match url.scheme:
         case '' | 'file':
             location = __.Path( url.path )
-            try: content_bytes = location.read_bytes( )
+            try:
+                content_bytes = await __.asyncio.to_thread(
+                    location.read_bytes )
             except Exception as exc:
                 raise _exceptions.DocumentationInaccessibility(
                     url_s, exc ) from exc
@@ -533,25 +692,15 @@ async def retrieve_url_as_text(
             result = await cache.access( url_s )
             if not __.is_absent( result ):
                 content_bytes, headers = result
-                _validate_textual_content(
-                    content_bytes, headers, url_s )
-                charset = _detect_charset_with_fallback(
-                    content_bytes, headers, charset_default )
-                return content_bytes.decode( charset )
-            async with client_factory( ) as client:
-                result, headers = await _retrieve_url(
-                    url, duration_max = duration_max,
-                    client = client,
-                    content_cache = cache,
-                    robots_cache = cache.robots_cache )
-            ttl = cache.determine_ttl( result )
-            await cache.store( url_s, result, headers, ttl )
-            content_bytes = result.extract( )
-            _validate_textual_content(
-                content_bytes, headers, url_s )
-            charset = _detect_charset_with_fallback(
-                content_bytes, headers, charset_default )
-            return content_bytes.decode( charset )
+                return _decode_textual_content(
+                    cache, url_s, content_bytes, headers, charset_default )
+            result, headers = await cache.share_request(
+                url_s, __.funct.partial(
+                    _retrieve_and_cache_url, cache, url,
+                    duration_max = duration_max,
+                    client_factory = client_factory ) )
+            return _decode_textual_content(
+                cache, url_s, result.extract( ), headers, charset_default )
         case _:
             raise _exceptions.DocumentationInaccessibility(
                 url_s, f"Unsupported scheme: {url.scheme}" )
@@ -580,6 +729,21 @@ async def _apply_request_delay(
         if delay: cache.assign_delay( domain, float( delay ) )
 
 
+@__.ctxl.asynccontextmanager
+async def _borrow_http_client(
+    client_factory: HttpClientFactory
+) -> __.cabc.AsyncIterator[ _httpx.AsyncClient ]:
+    ''' Produces HTTP client from factory for one request.
+
+        Clients which are not shared by the default factory are closed
+        afterwards, as they would be by their own context manager.
+    '''
+    client = client_factory( )
+    try: yield client
+    finally:
+        if not _http_client_holder.owns( client ): await client.aclose( )
+
+
 async def _cache_robots_txt_error(
     domain: str, cache: RobotsCache, error: Exception
 ) -> __.Absential[ _RobotFileParser ]:
@@ -621,6 +785,26 @@ async def _check_robots_txt(
         return True # if no robots.txt, then assume URL allowed
 
 
+def _decode_textual_content(
+    cache: ContentCache,
+    url: str,
+    content: bytes,
+    headers: _httpx.Headers,
+    charset_default: str,
+) -> str:
+    ''' Decodes cached content after validating that it is textual.
+
+        Content analysis is expensive for large documents, so its
+        outcome is recorded on the cache entry for later hits.
+    '''
+    charset = cache.access_charset( url )
+    if __.is_absent( charset ):
+        _validate_textual_content( content, headers, url )
+        charset = _detect_charset_with_fallback( content, headers, '' )
+        cache.assign_charset( url, charset )
+    return content.decode( charset or charset_default )
+
+
 def _detect_charset_with_fallback(
     content: bytes, headers: _httpx.Headers, default: str
 ) -> str:
@@ -647,12 +831,9 @@ def _extract_charset_from_headers(
 ) -> str:
     ''' Extracts charset from Content-Type header. '''
     content_type = headers.get( 'content-type', '' )
-    if isinstance( content_type, str ) and ';' in content_type:
-        _, _, params = content_type.partition( ';' )
-        if 'charset=' in params:
-            charset = params.split( 'charset=' )[ -1 ].strip( )
-            return charset.strip( '"\\\'\"' )
-    return default
+    match = _charset_regex.search( content_type )
+    if match is None: return default
+    return match[ 1 ]
 
 
 def _extract_domain( url: _Url ) -> str:
@@ -669,14 +850,29 @@ def _extract_mimetype_from_headers( headers: _httpx.Headers ) -> str:
     return content_type
 
 
+async def _probe_and_cache_url(
+    cache: ProbeCache, url: _Url, /, *,
+    duration_max: float,
+    client_factory: HttpClientFactory,
+) -> ProbeResponse:
+    ''' Makes HEAD request and caches its result. '''
+    async with _borrow_http_client( client_factory ) as client:
+        result = await _probe_url(
+            url, duration_max = duration_max,
+            client = client,
+            robots_cache = cache.robots_cache )
+    ttl = cache.determine_ttl( result )
+    await cache.store( url.geturl( ), result, ttl )
+    return result
+
+
 async def _probe_url(
     url: _Url, /, *,
     duration_max: float,
     client: _httpx.AsyncClient,
-    probe_cache: ProbeCache,
     robots_cache: RobotsCache,
 ) -> ProbeResponse:
-    ''' Makes HEAD request with deduplication. '''
+    ''' Makes HEAD request. '''
     url_s = url.geturl( )
     if not await _check_robots_txt(
         url, client = client, cache = robots_cache
@@ -685,16 +881,45 @@ async def _probe_url(
         return _generics.Error( _exceptions.UrlImpermissibility(
             url_s, robots_cache.user_agent ) )
     await _apply_request_delay( url, cache = robots_cache, client = client )
-    async with probe_cache.acquire_mutex_for( url_s ):
-        try:
-            response = await client.head(
-                url_s, timeout = duration_max, follow_redirects = True )
-        except Exception as exc:
-            _scribe.debug( f"HEAD request failed for {url_s}: {exc}" )
-            return _generics.Error( exc )
-        else:
-            return _generics.Value(
-                response.status_code < _http_success_threshold )
+    try:
+        response = await client.head(
+            url_s, timeout = duration_max, follow_redirects = True )
+    except Exception as exc:
+        _scribe.debug( f"HEAD request failed for {url_s}: {exc}" )
+        return _generics.Error( exc )
+    else:
+        return _generics.Value(
+            response.status_code < _http_success_threshold )
+
+
+def _replicate_exception( error: Exception ) -> Exception:
+    ''' Replicates exception with its type and state but no traceback.
+
+        The initializer is bypassed, since exception classes may require
+        arguments which are not retained in their state. Returns original
+        exception if it cannot be replicated.
+    '''
+    species = type( error )
+    try: replica = species.__new__( species, *error.args )
+    except Exception: return error
+    replica.__dict__.update( error.__dict__ )
+    return replica
+
+
+async def _retrieve_and_cache_url(
+    cache: ContentCache, url: _Url, /, *,
+    duration_max: float,
+    client_factory: HttpClientFactory,
+) -> tuple[ ContentResponse, _httpx.Headers ]:
+    ''' Makes GET request and caches its response. '''
+    async with _borrow_http_client( client_factory ) as client:
+        result, headers = await _retrieve_url(
+            url, duration_max = duration_max,
+            client = client,
+            robots_cache = cache.robots_cache )
+    ttl = cache.determine_ttl( result )
+    await cache.store( url.geturl( ), result, headers, ttl )
+    return result, headers
 
 
 async def _retrieve_robots_txt(
@@ -702,37 +927,35 @@ async def _retrieve_robots_txt(
 ) -> __.Absential[ _RobotFileParser ]:
     ''' Fetches and parses robots.txt for domain. '''
     robots_url = f"{domain}/robots.txt"
-    async with cache.acquire_mutex_for( domain ):
-        timeout = cache.request_timeout
-        try:
-            response = await client.get(
-                robots_url, timeout = timeout, follow_redirects = True )
-        except Exception as exc:
-            return await _cache_robots_txt_error( domain, cache, exc )
-        match response.status_code:
-            case _HttpStatus.OK: lines = response.text.splitlines( )
-            case _HttpStatus.NOT_FOUND: lines = [ ]
-            case _:
-                try: response.raise_for_status( )
-                except Exception as exc:
-                    return await _cache_robots_txt_error( domain, cache, exc )
-        robots_parser = _RobotFileParser( )
-        robots_parser.set_url( robots_url )
-        try: robots_parser.parse( lines )
-        except Exception as exc:
-            return await _cache_robots_txt_error( domain, cache, exc )
-        result: RobotsResponse = _generics.Value( robots_parser )
-        return await _cache_robots_txt_result( cache, domain, result )
+    timeout = cache.request_timeout
+    try:
+        response = await client.get(
+            robots_url, timeout = timeout, follow_redirects = True )
+    except Exception as exc:
+        return await _cache_robots_txt_error( domain, cache, exc )
+    match response.status_code:
+        case _HttpStatus.OK: lines = response.text.splitlines( )
+        case _HttpStatus.NOT_FOUND: lines = [ ]
+        case _:
+            try: response.raise_for_status( )
+            except Exception as exc:
+                return await _cache_robots_txt_error( domain, cache, exc )
+    robots_parser = _RobotFileParser( )
+    robots_parser.set_url( robots_url )
+    try: robots_parser.parse( lines )
+    except Exception as exc:
+        return await _cache_robots_txt_error( domain, cache, exc )
+    result: RobotsResponse = _generics.Value( robots_parser )
+    return await _cache_robots_txt_result( cache, domain, result )
 
 
 async def _retrieve_url(
     url: _Url, /, *,
     duration_max: float,
     client: _httpx.AsyncClient,
-    content_cache: ContentCache,
     robots_cache: RobotsCache,
 ) -> tuple[ ContentResponse, _httpx.Headers ]:
-    ''' Makes GET request with deduplication. '''
+    ''' Makes GET request. '''
     url_s = url.geturl( )
     if not await _check_robots_txt(
         url, cache = robots_cache, client = client
@@ -742,15 +965,14 @@ async def _retrieve_url(
                 url_s, robots_cache.user_agent ) ),
             _httpx.Headers( ) )
     await _apply_request_delay( url, cache = robots_cache, client = client )
-    async with content_cache.acquire_mutex_for( url_s ):
-        try:
-            response = await client.get(
-                url_s, timeout = duration_max, follow_redirects = True )
-            response.raise_for_status( )
-        except Exception as exc:
-            _scribe.debug( f"GET request failed for {url_s}: {exc}" )
-            return _generics.Error( exc ), _httpx.Headers( )
-        else: return _generics.Value( response.content ), response.headers
+    try:
+        response = await client.get(
+            url_s, timeout = duration_max, follow_redirects = True )
+        response.raise_for_status( )
+    except Exception as exc:
+        _scribe.debug( f"GET request failed for {url_s}: {exc}" )
+        return _generics.Error( exc ), _httpx.Headers( )
+    else: return _generics.Value( response.content ), response.headers
 
 
 def _validate_textual_content(
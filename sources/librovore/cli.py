@@ -383,6 +383,7 @@ class Cli( _appcore_cli.Application ):
     ) -> _state.Globals:
         ''' Prepares librovore-specific global state with cache proxies. '''
         auxdata_base = await super( ).prepare( exits )
+        exits.push_async_callback( _cacheproxy.aclose_http_client )
         content_cache, probe_cache, robots_cache = _cacheproxy.prepare(
             auxdata_base )
         nomargs = {
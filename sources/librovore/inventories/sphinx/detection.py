@@ -63,22 +63,27 @@ def derive_inventory_url( base_url: _Url ) -> _Url:
 
 
 def extract_inventory( base_url: _Url ) -> _sphobjinv.Inventory:
-    ''' Extracts and parses Sphinx inventory from URL or file path. '''
+    ''' Extracts and parses Sphinx inventory from URL or file path.
+
+        Inventories from files are cached and shared between callers, so
+        the returned inventory must not be mutated.
+    '''
     url = derive_inventory_url( base_url )
     url_s = url.geturl( )
-    nomargs: __.NominativeArguments = { }
     match url.scheme:
-        case 'http' | 'https': nomargs[ 'url' ] = url_s
-        case 'file': nomargs[ 'fname_zlib' ] = url.path
+        case 'http' | 'https':
+            return _parse_inventory( url_s, { 'url': url_s } )
+        case 'file':
+            try: status = __.os.stat( url.path )
+            except OSError as exc:
+                raise __.InventoryInaccessibility(
+                    url_s, cause = exc ) from exc
+            return _parse_inventory_file(
+                url_s, url.path,
+                ( status.st_mtime_ns, status.st_size, status.st_ino ) )
         case _:
             raise __.InventoryUrlNoSupport(
                 url, component = 'scheme', value = url.scheme )
-    try: return _sphobjinv.Inventory( **nomargs )
-    except ( ConnectionError, OSError, TimeoutError ) as exc:
-        raise __.InventoryInaccessibility(
-            url_s, cause = exc ) from exc
-    except Exception as exc:
-        raise __.InventoryInvalidity( url_s, cause = exc ) from exc
 
 
 async def filter_inventory(
@@ -167,3 +172,28 @@ def format_inventory_object(
             priority = objct.priority,
             inventory_project = inventory.project,
             inventory_version = inventory.version ) )
+
+
+def _parse_inventory(
+    url_s: str, nomargs: __.NominativeArguments
+) -> _sphobjinv.Inventory:
+    ''' Parses Sphinx inventory, mapping failures to package exceptions. '''
+    try: return _sphobjinv.Inventory( **nomargs )
+    except ( ConnectionError, OSError, TimeoutError ) as exc:
+        raise __.InventoryInaccessibility(
+            url_s, cause = exc ) from exc
+    except Exception as exc:
+        raise __.InventoryInvalidity( url_s, cause = exc ) from exc
+
+
+@__.funct.lru_cache( maxsize = 32 )
+def _parse_inventory_file(
+    url_s: str, path: str, signature: tuple[ int, int, int ]
+) -> _sphobjinv.Inventory:
+    ''' Parses Sphinx inventory file once per file signature.
+
+        Signature of modification time, size, and inode catches rewrites
+        within one timestamp tick on filesystems with coarse timestamps,
+        unless they preserve both size and inode.
+    '''
+    return _parse_inventory( url_s, { 'fname_zlib': path } )
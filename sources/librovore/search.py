@@ -72,19 +72,18 @@ def _filter_exact(
     ''' Applies exact matching with partial_ratio for precision discovery. '''
     results: list[ _results.SearchResult ] = [ ]
     term_compare = term if case_sensitive else term.lower( )
-    for obj in objects:
-        obj_name_compare = obj.name if case_sensitive else obj.name.lower( )
-        if obj_name_compare == term_compare:
+    names = _prepare_names( objects, case_sensitive )
+    partial_scores = _score_names(
+        term_compare, names, _rapidfuzz.fuzz.partial_ratio,
+        _EXACT_THRESHOLD_MIN ) if contains_term else { }
+    for index, obj in enumerate( objects ):
+        if names[ index ] == term_compare:
             score = 1.0
             reason = 'exact match'
-        elif contains_term:
-            partial_score = _rapidfuzz.fuzz.partial_ratio(
-                term_compare, obj_name_compare )
-            if partial_score >= _EXACT_THRESHOLD_MIN:
-                score = partial_score / 100.0
-                reason = f'partial match ({partial_score}%)'
-            else:
-                continue
+        elif index in partial_scores:
+            partial_score = partial_scores[ index ]
+            score = partial_score / 100.0
+            reason = f'partial match ({partial_score}%)'
         else:
             continue
         results.append( _results.SearchResult.from_inventory_object(
@@ -118,26 +117,58 @@ def _filter_similar(
     ''' Applies similar matching with partial_ratio for discovery. '''
     results: list[ _results.SearchResult ] = [ ]
     term_compare = term if case_sensitive else term.lower( )
-    for obj in objects:
-        obj_name_compare = obj.name if case_sensitive else obj.name.lower( )
-        if obj_name_compare == term_compare:
+    names = _prepare_names( objects, case_sensitive )
+    partial_scores: dict[ int, float ] = { }
+    regular_scores: dict[ int, float ] = { }
+    if contains_term:
+        partial_scores = _score_names(
+            term_compare, names, _rapidfuzz.fuzz.partial_ratio,
+            similarity_score_min )
+        regular_scores = _score_names(
+            term_compare, names, _rapidfuzz.fuzz.ratio,
+            similarity_score_min )
+    for index, obj in enumerate( objects ):
+        if names[ index ] == term_compare:
             score = 1.0
             reason = 'exact match'
-        elif contains_term:
-            partial_score = _rapidfuzz.fuzz.partial_ratio(
-                term_compare, obj_name_compare )
-            regular_score = _rapidfuzz.fuzz.ratio(
-                term_compare, obj_name_compare )
+        elif index in partial_scores or index in regular_scores:
+            # Scores below minimum are absent and lose to the other score.
+            partial_score = partial_scores.get( index, 0.0 )
+            regular_score = regular_scores.get( index, 0.0 )
             ratio = max( partial_score, regular_score )
-            if ratio >= similarity_score_min:
-                score = ratio / 100.0
-                score_type = ( 'partial' if partial_score > regular_score 
-                              else 'similar' )
-                reason = f'{score_type} match ({ratio}%)'
-            else:
-                continue
+            score = ratio / 100.0
+            score_type = ( 'partial' if partial_score > regular_score
+                          else 'similar' )
+            reason = f'{score_type} match ({ratio}%)'
         else:
             continue
         results.append( _results.SearchResult.from_inventory_object(
             obj, score = score, match_reasons = [ reason ] ) )
     return results
+
+
+def _prepare_names(
+    objects: __.cabc.Sequence[ _results.InventoryObject ],
+    case_sensitive: bool,
+) -> list[ str ]:
+    ''' Prepares object names for comparison against search term. '''
+    if case_sensitive: return [ obj.name for obj in objects ]
+    return [ obj.name.lower( ) for obj in objects ]
+
+
+def _score_names(
+    term: str,
+    names: __.cabc.Sequence[ str ],
+    scorer: __.cabc.Callable[ ..., float ],
+    score_min: float,
+) -> dict[ int, float ]:
+    ''' Scores all names against term in one native batch.
+
+        Returns scores, which meet the minimum, by name index. Names are
+        compared as given; no default preprocessing is applied.
+    '''
+    return {
+        index: score
+        for _, score, index in _rapidfuzz.process.extract_iter(
+            term, names,
+            scorer = scorer, processor = None, score_cutoff = score_min ) }
@@ -26,6 +26,7 @@ from mcp.server.fastmcp import FastMCP as _FastMCP
 from pydantic import Field as _Field
 
 from . import __
+from . import cacheproxy as _cacheproxy
 from . import exceptions as _exceptions
 from . import functions as _functions
 from . import interfaces as _interfaces
@@ -112,10 +113,12 @@ async def serve(
     mcp = _FastMCP( 'Librovore Documentation Server', port = port )
     _register_server_functions(
         auxdata, mcp, extra_functions = extra_functions )
-    match transport:
-        case 'sse': await mcp.run_sse_async( mount_path = None )
-        case 'stdio': await mcp.run_stdio_async( )
-        case _: raise ValueError
+    try:
+        match transport:
+            case 'sse': await mcp.run_sse_async( mount_path = None )
+            case 'stdio': await mcp.run_stdio_async( )
+            case _: raise ValueError
+    finally: await _cacheproxy.aclose_http_client( )
 
 
 def _produce_detect_function( auxdata: _state.Globals ):
@@ -22,13 +22,49 @@
 
 
 import asyncio
+import contextlib
 import json
+import logging
 import os
 import signal
 import sys
+import zlib
 
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, redirect_stderr, redirect_stdout
+from io import StringIO
 from pathlib import Path
+from unittest.mock import patch
+
+import librovore.cli as _cli
+
+
+try: import orjson as _orjson
+except ImportError: # pragma: no cover
+    from json import loads as _loads_json
+
+    def _encode_frame( obj ) -> bytes:
+        return f"{json.dumps( obj )}\n".encode( )
+else:
+    _loads_json = _orjson.loads
+
+    def _encode_frame( obj ) -> bytes:
+        return _orjson.dumps( obj, option = _orjson.OPT_APPEND_NEWLINE )
+
+
+_PIPE_BUFFER_SIZE = 1 << 20
+
+# Requests without dynamic content besides their identifiers are
+# serialized once; the identifier is interpolated per call.
+_INITIALIZE_FRAME = (
+    b'{"jsonrpc":"2.0","method":"initialize","params":{'
+    b'"protocolVersion":"2024-11-05",'
+    b'"capabilities":{"roots":{"listChanged":true},"sampling":{}},'
+    b'"clientInfo":{"name":"test-client","version":"1.0.0"}},'
+    b'"id":%d}\n' )
+_INITIALIZED_FRAME = (
+    b'{"jsonrpc":"2.0","method":"notifications/initialized"}\n' )
+_LIST_TOOLS_FRAME = (
+    b'{"jsonrpc":"2.0","method":"tools/list","params":{},"id":%d}\n' )
 
 
 class MCPTestClient:
@@ -50,48 +86,54 @@ class MCPTestClient:
         self.request_id += 1
         if 'id' not in request:
             request[ 'id' ] = self.request_id
+        await self.send_messages( request )
+        return await self.receive_message( )
+
+    async def send_messages( self, *messages: dict ) -> None:
+        ''' Writes newline-delimited JSON-RPC messages to server. '''
+        await self.send_frames(
+            *( _encode_frame( message ) for message in messages ) )
+
+    async def send_frames( self, *frames: bytes ) -> None:
+        ''' Writes pre-serialized message frames to server.
 
-        # Send request via stdin
-        request_line = json.dumps( request ) + '\n'
-        self.process.stdin.write( request_line.encode( ) )
+            All frames go out in a single write and drain.
+        '''
+        self.process.stdin.write( b''.join( frames ) )
         await self.process.stdin.drain( )
 
-        # Read response from stdout
-        response_line = await self.process.stdout.readline( )
-        if not response_line:
-            raise RuntimeError( "No response from MCP server" )
-        return json.loads( response_line.decode( ).strip( ) )
+    async def receive_message( self, timeout: float = 5.0 ) -> dict:
+        ''' Reads one newline-delimited JSON-RPC message from server.
+
+            The MCP stdio transport frames messages by newline, so the
+            whole frame is pulled from the stream buffer in one pass.
+            Also serves as the readiness probe for a freshly spawned
+            server: the first response arrives once it is listening.
+        '''
+        try:
+            frame = await asyncio.wait_for(
+                self.process.stdout.readuntil( b'\n' ), timeout )
+        except ( asyncio.IncompleteReadError, asyncio.TimeoutError ) as exc:
+            raise RuntimeError( "No response from MCP server" ) from exc
+        except asyncio.LimitOverrunError as exc:
+            raise RuntimeError(
+                "Response from MCP server exceeds stream limit" ) from exc
+        return _loads_json( frame )
 
     async def initialize( self ) -> dict:
         ''' Completes MCP initialization handshake. '''
-        request = {
-            "jsonrpc": "2.0",
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "roots": { "listChanged": True },
-                    "sampling": { }
-                },
-                "clientInfo": { "name": "test-client", "version": "1.0.0" }
-            }
-        }
-        result = await self.send_request( request )
-        notification = json.dumps( {
-            "jsonrpc": "2.0",
-            "method": "notifications/initialized"
-        } ) + '\n'
-        self.process.stdin.write( notification.encode( ) )
-        await self.process.stdin.drain( )
-        return result
+        self.request_id += 1
+        # Server handles messages in arrival order, so the notification
+        # can trail the request in the same write.
+        await self.send_frames(
+            _INITIALIZE_FRAME % self.request_id, _INITIALIZED_FRAME )
+        return await self.receive_message( )
 
     async def list_tools( self ) -> dict:
         ''' Lists available MCP tools. '''
-        return await self.send_request( {
-            "jsonrpc": "2.0",
-            "method": "tools/list",
-            "params": { }
-        } )
+        self.request_id += 1
+        await self.send_frames( _LIST_TOOLS_FRAME % self.request_id )
+        return await self.receive_message( )
 
     async def call_tool( self, name: str, arguments: dict ) -> dict:
         ''' Calls MCP tool with arguments. '''
@@ -110,40 +152,45 @@ async def mcp_test_server( ):
         stdin = asyncio.subprocess.PIPE,
         stdout = asyncio.subprocess.PIPE,
         stderr = asyncio.subprocess.PIPE,
-        preexec_fn = os.setsid
+        limit = _PIPE_BUFFER_SIZE,
+        start_new_session = True
     )
-    try:
-        await asyncio.sleep( 1 )
-        yield process
+    # No startup delay: stdin is buffered by the pipe until the server
+    # reads it, and the initialize response signals readiness.
+    try: yield process
     finally: await cleanup_server_process( process )
 
 
-async def cleanup_server_process( process ):
-    ''' Clean up server process using dependency injection pattern. '''
+async def cleanup_server_process(
+    process, grace: float = 0.5, hard: float = 1.0
+):
+    ''' Clean up server process using dependency injection pattern.
+
+        Escalates from termination of the process, to termination of its
+        process group, to killing both. Each polite attempt waits up to
+        ``grace`` seconds and the kill up to ``hard`` seconds, so cleanup
+        of an unresponsive server is bounded by ``2 * grace + hard``.
+    '''
     if process.returncode is not None: return
     try:
         process.terminate( )
         try:
-            await asyncio.wait_for( process.wait( ), timeout = 2.0 )
+            await asyncio.wait_for( process.wait( ), timeout = grace )
             return  # Graceful termination worked
         except asyncio.TimeoutError:
             pass
         try:
             os.killpg( os.getpgid( process.pid ), signal.SIGTERM )
-            await asyncio.wait_for( process.wait( ), timeout = 2.0 )
+            await asyncio.wait_for( process.wait( ), timeout = grace )
             return  # Process group termination worked
         except ( ProcessLookupError, OSError, asyncio.TimeoutError ):
             pass
-        try:
-            process.kill( )
-            await asyncio.wait_for( process.wait( ), timeout = 1.0 )
-        except ( ProcessLookupError, asyncio.TimeoutError ):
-            # Process might be stuck, try process group kill
-            try:
-                os.killpg( os.getpgid( process.pid ), signal.SIGKILL )
-                await process.wait( )
-            except ( ProcessLookupError, OSError ):
-                pass  # Process is gone or cleanup failed
+        with contextlib.suppress( ProcessLookupError ): process.kill( )
+        with contextlib.suppress( ProcessLookupError, OSError ):
+            os.killpg( os.getpgid( process.pid ), signal.SIGKILL )
+        # Process may be stuck in kernel; give up after hard budget.
+        with contextlib.suppress( asyncio.TimeoutError ):
+            await asyncio.wait_for( process.wait( ), timeout = hard )
     finally:
         # Always close pipes to prevent warnings
         try:
@@ -157,6 +204,32 @@ async def cleanup_server_process( process ):
             pass  # Ignore expected pipe cleanup errors
 
 
+def _build_mock_inventory_bytes( ) -> bytes:
+    header = (
+        b'# Sphinx inventory version 2\n'
+        b'# Project: Librovore Test\n'
+        b'# Version: 1.0\n'
+        b'# The remainder of this file is compressed using zlib.\n' )
+    objects = (
+        b'librovore py:module 0 api.html#module-$ -\n'
+        b'librovore.functions py:module 0 api.html#module-$ -\n'
+        b'librovore.functions.query_inventory py:function 1 api.html#$ -\n'
+        b'test-inventory std:label -1 testing.html#$ Test Inventory\n' )
+    # Compression ratio is irrelevant for tests; fastest level suffices.
+    return header + zlib.compress( objects, level = 1 )
+
+
+_MOCK_INVENTORY_BYTES = _build_mock_inventory_bytes( )
+
+
+def mock_inventory_bytes( ) -> bytes:
+    ''' Creates minimal test inventory data.
+
+        Data is deterministic, so it is built once at module load.
+    '''
+    return _MOCK_INVENTORY_BYTES
+
+
 def get_test_inventory_path( site_name: str = 'librovore' ) -> str:
     ''' Gets path to test inventory file. '''
     test_dir = Path( __file__ ).parent.parent
@@ -233,7 +306,8 @@ async def run_cli_command( args: list[ str ] ):
     process = await asyncio.create_subprocess_exec(
         sys.executable, '-m', 'librovore', *args,
         stdout = asyncio.subprocess.PIPE,
-        stderr = asyncio.subprocess.PIPE )
+        stderr = asyncio.subprocess.PIPE,
+        limit = _PIPE_BUFFER_SIZE )
     stdout, stderr = await process.communicate( )
     return MockCompletedProcess(
         returncode = process.returncode,
@@ -241,6 +315,41 @@ async def run_cli_command( args: list[ str ] ):
         stderr = stderr.decode( ) )
 
 
+def run_cli_command_inprocess( args: list[ str ] ):
+    ''' Runs CLI argument parsing within test process and returns result.
+
+        Avoids interpreter startup and package import per invocation.
+        Only for invocations which end in argument parsing, such as help
+        and usage errors. Executed commands register processors and
+        configure logging for the whole process, so they belong on the
+        subprocess runner; reaching execution fails the calling test.
+        Must be called outside of a running event loop, since the CLI
+        entrypoint runs its own loop.
+    '''
+    stdout, stderr = StringIO( ), StringIO( )
+    handlers, level = logging.root.handlers[ : ], logging.root.level
+    returncode = None
+    try:
+        with (
+            patch.object( sys, 'argv', [ 'librovore', *args ] ),
+            redirect_stdout( stdout ), redirect_stderr( stderr ),
+        ):
+            try: _cli.execute( )
+            except SystemExit as exc:
+                if exc.code in ( None, 0, 2 ): returncode = exc.code or 0
+    finally:
+        logging.root.handlers[ : ] = handlers
+        logging.root.setLevel( level )
+    if returncode is None:
+        raise AssertionError(
+            f"CLI invocation {args!r} ran past argument parsing; "
+            "use the subprocess runner for it." )
+    return MockCompletedProcess(
+        returncode = returncode,
+        stdout = stdout.getvalue( ),
+        stderr = stderr.getvalue( ) )
+
+
 def get_fake_extension_url():
     ''' Get file:// URL for fake extension package. '''
     fake_extension_path = (
@@ -23,21 +23,20 @@
 
 import pytest
 
-from . import __
+import librovore.__ as _internals
+import librovore.__.imports as _imports
 
 
 def test_000_common_imports_available( ):
     ''' Common imports module provides expected utilities. '''
-    module = __.cache_import_module( f"{__.PACKAGE_NAME}.__" )
-    assert hasattr( module, 'asyncio' )
-    assert hasattr( module, 'json' )
-    assert hasattr( module, 'sys' )
+    assert hasattr( _internals, 'asyncio' )
+    assert hasattr( _internals, 'json' )
+    assert hasattr( _internals, 'sys' )
 
 
 def test_010_globals_type_available( ):
     ''' Globals type is properly defined. '''
-    module = __.cache_import_module( f"{__.PACKAGE_NAME}.__" )
-    assert hasattr( module, 'Globals' )
+    assert hasattr( _internals, 'Globals' )
 
 
 @pytest.mark.parametrize(
@@ -45,21 +44,18 @@ def test_010_globals_type_available( ):
 )
 def test_100_exports( module_name ):
     ''' Module exports expected names. '''
-    module = __.cache_import_module( f"{__.PACKAGE_NAME}.__.imports" )
-    assert hasattr( module, module_name )
+    assert hasattr( _imports, module_name )
 
 
 def test_110_asyncio_functionality( ):
     ''' Asyncio import provides expected functionality. '''
-    module = __.cache_import_module( f"{__.PACKAGE_NAME}.__" )
-    asyncio = module.asyncio
+    asyncio = _internals.asyncio
     assert hasattr( asyncio, 'run' )
     assert hasattr( asyncio, 'create_subprocess_exec' )
 
 
 def test_120_json_functionality( ):
     ''' JSON import provides expected functionality. '''
-    module = __.cache_import_module( f"{__.PACKAGE_NAME}.__" )
-    json = module.json
+    json = _internals.json
     assert hasattr( json, 'dumps' )
     assert hasattr( json, 'loads' )
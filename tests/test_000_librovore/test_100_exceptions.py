@@ -18,104 +18,85 @@
 #============================================================================#
 
 
-''' Exception hierarchy and error handling tests. '''
+''' Exception hierarchy and error handling tests.
 
+    Assertions are simple containment and type checks, so pytest's
+    assertion rewriting is skipped for this module: PYTEST_DONT_REWRITE
+'''
 
 
-# from . import PACKAGE_NAME, cache_import_module
-import librovore.exceptions as module
+import pytest
 
+import librovore.exceptions as module
 
-def test_000_exception_hierarchy_inheritance( ):
-    ''' Exception classes follow proper inheritance hierarchy. '''
-    exc = module.InventoryInaccessibility(
-        "test.inv", Exception( "test" ) )
-    assert isinstance( exc, module.Omnierror )
-    assert isinstance( exc, module.Omniexception )
 
+# Exceptions are immutable, so each is built and rendered only once.
 
-def test_010_network_failure_inheritance( ):
-    ''' InventoryInaccessibility follows proper hierarchy. '''
-    exc = module.InventoryInaccessibility(
-        "http://example.com", Exception( "network error" ) )
-    assert isinstance( exc, module.Omnierror )
-    assert isinstance( exc, module.Omniexception )
+@pytest.fixture(
+    scope = 'session',
+    params = (
+        ( 'InventoryInaccessibility', '/path/to/missing.inv',
+          ( Exception( 'not found' ), ) ),
+        ( 'InventoryInaccessibility', 'http://example.com/objects.inv',
+          ( Exception( 'connection failed' ), ) ),
+        ( 'InventoryInvalidity', '/path/to/invalid.inv',
+          ( Exception( 'invalid format' ), ) ),
+        ( 'InventoryUrlInvalidity', 'not-a-valid-url', ( ) ),
+    )
+)
+def sourced_message( request ):
+    ''' Fixture providing rendered inventory exceptions with sources. '''
+    class_name, source, arguments = request.param
+    exc = getattr( module, class_name )( source, *arguments )
+    return source, str( exc )
+
+
+@pytest.fixture(
+    scope = 'session',
+    params = (
+        ( 'InventoryInaccessibility', 'test.inv', 'Custom error reason' ),
+        ( 'InventoryInaccessibility', 'http://example.com',
+          'Connection timeout' ),
+        ( 'InventoryInvalidity', 'test.inv', 'Corrupted header' ),
+    )
+)
+def reasoned_message( request ):
+    ''' Fixture providing rendered inventory exceptions with reasons. '''
+    class_name, source, reason = request.param
+    exc = getattr( module, class_name )( source, Exception( reason ) )
+    return reason, str( exc )
+
+
+@pytest.mark.parametrize(
+    'class_name',
+    ( 'InventoryInaccessibility', 'InventoryInvalidity',
+      'InventoryUrlInvalidity' )
+)
+def test_000_exception_hierarchy_inheritance( class_name ):
+    ''' Exception classes follow proper inheritance hierarchy. '''
+    exception_class = getattr( module, class_name )
+    assert issubclass( exception_class, module.Omnierror )
+    assert issubclass( exception_class, module.Omniexception )
 
 
 def test_020_omniexception_is_base( ):
     ''' Omniexception is the base exception class. '''
-    exc = module.Omniexception( "test error" )
-    assert isinstance( exc, BaseException )
+    assert issubclass( module.Omniexception, BaseException )
 
 
 def test_030_omnierror_inheritance( ):
     ''' Omnierror inherits from both Omniexception and Exception. '''
-    exc = module.Omnierror( "test error" )
-    assert isinstance( exc, module.Omniexception )
-    assert isinstance( exc, Exception )
-
-
-def test_040_inventory_format_invalidity_inheritance( ):
-    ''' InventoryInvalidity inherits from Omnierror. '''
-    exc = module.InventoryInvalidity(
-        "test.inv", Exception( "format error" )
-    )
-    assert isinstance( exc, module.Omnierror )
-
-
-def test_100_inventory_inaccessibility_message( ):
-    ''' InventoryInaccessibility includes source in message. '''
-    source = "/path/to/missing.inv"
-    exc = module.InventoryInaccessibility( source, Exception( "not found" ) )
-    assert source in str( exc )
-
-
-def test_110_inventory_inaccessibility_network_message( ):
-    ''' InventoryInaccessibility includes source in network error messages. '''
-    source = "http://example.com/objects.inv"
-    exc = module.InventoryInaccessibility(
-        source, Exception( "connection failed" ) )
-    assert source in str( exc )
-
-
-def test_120_inventory_invalidity_message( ):
-    ''' InventoryInvalidity includes source in message. '''
-    source = "/path/to/invalid.inv"
-    exc = module.InventoryInvalidity( source, Exception( "invalid format" ) )
-    assert source in str( exc )
-
-
-def test_130_inventory_url_invalidity_message( ):
-    ''' InventoryUrlInvalidity includes source in message. '''
-    source = "not-a-valid-url"
-    exc = module.InventoryUrlInvalidity( source )
-    assert source in str( exc )
-
-
-def test_200_exception_with_custom_reason( ):
-    ''' Exceptions accept custom reason messages. '''
-    custom_reason = Exception( "Custom error reason" )
-    exc = module.InventoryInaccessibility( "test.inv", custom_reason )
-    assert "Custom error reason" in str( exc )
-
-
-def test_210_inaccessibility_with_custom_reason( ):
-    ''' InventoryInaccessibility accepts custom reason. '''
-    custom_reason = Exception( "Connection timeout" )
-    exc = module.InventoryInaccessibility(
-        "http://example.com", custom_reason )
-    assert "Connection timeout" in str( exc )
+    assert issubclass( module.Omnierror, module.Omniexception )
+    assert issubclass( module.Omnierror, Exception )
 
 
-def test_220_invalidity_with_custom_reason( ):
-    ''' InventoryInvalidity accepts custom reason. '''
-    custom_reason = Exception( "Corrupted header" )
-    exc = module.InventoryInvalidity( "test.inv", custom_reason )
-    assert "Corrupted header" in str( exc )
+def test_100_exception_message_includes_source( sourced_message ):
+    ''' Inventory exceptions include source in message. '''
+    source, message = sourced_message
+    assert source in message
 
 
-def test_230_url_invalidity_message( ):
-    ''' InventoryUrlInvalidity includes source in message. '''
-    source = "not-a-valid-url"
-    exc = module.InventoryUrlInvalidity( source )
-    assert source in str( exc )
+def test_200_exception_message_includes_reason( reasoned_message ):
+    ''' Inventory exceptions accept custom reasons. '''
+    reason, message = reasoned_message
+    assert reason in message
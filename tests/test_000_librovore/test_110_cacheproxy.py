@@ -24,6 +24,7 @@
 
 
 import asyncio
+import threading
 
 from unittest.mock import Mock, patch  # , AsyncMock
 from urllib.parse import ParseResult as Url
@@ -31,6 +32,7 @@ from urllib.parse import ParseResult as Url
 import appcore.generics as _generics
 import httpx as _httpx
 import pytest
+import pytest_asyncio
 
 import librovore.cacheproxy as module
 
@@ -55,18 +57,63 @@ _URL_FILE_MISSING = Url(
 _URL_FTP_TEST = Url(
     scheme = 'ftp', netloc = 'example.com', path = '/test',
     params = '', query = '', fragment = '' )
-_URL_EMPTY_SCHEME = Url(
-    scheme = '', netloc = '', path = '/test/file.txt',
-    params = '', query = '', fragment = '' )
+_URL_HTTP_TEST_S = _URL_HTTP_TEST.geturl( )
+_URL_HTTP_MISSING_S = _URL_HTTP_MISSING.geturl( )
 
 _HEADERS_TEXT_PLAIN = _httpx.Headers( { 'content-type': 'text/plain' } )
 _HEADERS_TEXT_HTML = _httpx.Headers( { 'content-type': 'text/html' } )
 _HEADERS_APP_JSON = _httpx.Headers( {
     'content-type': 'application/json; charset=utf-8' } )
 _HEADERS_IMAGE_PNG = _httpx.Headers( { 'content-type': 'image/png' } )
+_HEADERS_EMPTY = _httpx.Headers( )
+_HEADERS_HTML_ISO = _httpx.Headers( {
+    'content-type': 'text/html; charset=iso-8859-1' } )
+_HEADERS_HTML_UTF16_Q = _httpx.Headers( {
+    'content-type': 'text/html; charset="utf-16"' } )
+_HEADERS_HTML_BOUNDARY = _httpx.Headers( {
+    'content-type': 'text/html; boundary=something' } )
+_HEADERS_HTML_PARAMS = _httpx.Headers( {
+    'content-type': 'text/html; Charset = UTF-8; format=flowed' } )
 
+_RESPONSE_TRUE = _generics.Value( True )
+_RESPONSE_TEST_CONTENT = _generics.Value( b'test content' )
+_RESPONSE_ERROR = _generics.Error( Exception( 'test error' ) )
 
-@pytest.fixture
+
+class _Clock:
+    ''' Time function which reports a settable instant. '''
+
+    def __init__( self, now: float = 1000.0 ) -> None:
+        self.now = now
+
+    def __call__( self ) -> float: return self.now
+
+
+def _produce_file_url( location: __.Path, scheme: str = 'file' ) -> Url:
+    ''' Produces file URL for location on real filesystem. '''
+    return Url(
+        scheme = scheme, netloc = '', path = str( location ),
+        params = '', query = '', fragment = '' )
+
+
+class _StubCache:
+    ''' Cache which answers every access with a prepared result. '''
+
+    def __init__( self, result: __.typx.Any ) -> None:
+        self.result = result
+        self.accesses: list[ str ] = [ ]
+
+    async def access( self, url: str ) -> __.typx.Any:
+        self.accesses.append( url )
+        return self.result
+
+    def access_charset( self, url: str ) -> __.Absential[ str ]:
+        return __.absent
+
+    def assign_charset( self, url: str, charset: str ) -> None: pass
+
+
+@pytest.fixture( scope = 'module' )
 def test_delay_fn( ):
     ''' No-op delay function for fast tests. '''
     async def delay( seconds: float ) -> None:
@@ -75,44 +122,65 @@ def test_delay_fn( ):
 
 
 @pytest.fixture
-def content_cache( test_delay_fn, robots_cache ):
+def test_clock( ):
+    ''' Adjustable clock for deterministic cache timestamps. '''
+    return _Clock( )
+
+
+@pytest.fixture
+def content_cache( test_delay_fn, test_clock, robots_cache ):
     ''' Content cache with test configuration. '''
     return module.ContentCache(
         robots_cache = robots_cache,
         memory_max = 1024,
         error_ttl = 30.0,
         success_ttl = 300.0,
-        delay_function = test_delay_fn )
+        delay_function = test_delay_fn,
+        time_function = test_clock )
 
 
 @pytest.fixture
-def probe_cache( test_delay_fn, robots_cache ):
+def probe_cache( test_delay_fn, test_clock, robots_cache ):
     ''' Probe cache with test configuration. '''
     return module.ProbeCache(
         robots_cache = robots_cache,
         entries_max = 500,
         error_ttl = 30.0,
         success_ttl = 300.0,
-        delay_function = test_delay_fn )
-
-
-@pytest.fixture
-def mock_client_factory( ):
-    ''' Factory for creating mock HTTP clients with customizable responses. '''
-    def _factory( status = 200, content = b'test content', headers = None ):
-        if headers is None:
-            headers = { 'content-type': 'text/plain' }
-        def handler( request ):
-            return _httpx.Response(
-                status, content = content, headers = headers )
+        delay_function = test_delay_fn,
+        time_function = test_clock )
+
+
+@pytest_asyncio.fixture
+async def mock_client_factory( ):
+    ''' Factory for creating mock HTTP clients with customizable responses.
+
+        Each produced client factory hands out fresh clients, which are
+        closed after each request. Any left open are closed when the test
+        finishes.
+    '''
+    clients: list[ _httpx.AsyncClient ] = [ ]
+    def _factory(
+        status = 200, content = b'test content', headers = None,
+        handler = None,
+    ):
+        if handler is None:
+            if headers is None:
+                headers = { 'content-type': 'text/plain' }
+            def handler( request ):
+                return _httpx.Response(
+                    status, content = content, headers = headers )
         mock_transport = _httpx.MockTransport( handler )
         def client_factory( ):
-            return _httpx.AsyncClient( transport = mock_transport )
+            client = _httpx.AsyncClient( transport = mock_transport )
+            clients.append( client )
+            return client
         return client_factory
-    return _factory
+    yield _factory
+    for client in clients: await client.aclose( )
 
 
-@pytest.fixture
+@pytest.fixture( scope = 'module' )
 def safe_robots_parser_factory( robots_txt_samples ):
     ''' Factory for creating safe RobotFileParser instances. '''
     def _create_parser(
@@ -136,36 +204,31 @@ def safe_robots_parser_factory( robots_txt_samples ):
 
 
 
-@patch.object( module.__.time, 'time', return_value = 1000.0 )
-def test_010_cache_entry_fresh_not_extant( mock_time ):
+def test_010_cache_entry_fresh_not_extant( ):
     ''' Fresh entries are not extant. '''
     entry = module.CacheEntry( timestamp = 950.0, ttl = 100.0 )
-    assert not entry.invalid
+    assert not entry.invalid( 1000.0 )
 
 
-@patch.object( module.__.time, 'time', return_value = 1000.0 )
-def test_011_cache_entry_expired_is_extant( mock_time ):
+def test_011_cache_entry_expired_is_extant( ):
     ''' Expired entries are extant. '''
     entry = module.CacheEntry( timestamp = 800.0, ttl = 100.0 )
-    assert entry.invalid
+    assert entry.invalid( 1000.0 )
 
 
-@patch.object( module.__.time, 'time', return_value = 1000.0 )
-def test_012_cache_entry_boundary_condition( mock_time ):
+def test_012_cache_entry_boundary_condition( ):
     ''' Expiration boundary is handled correctly. '''
+    entry = module.CacheEntry( timestamp = 900.0, ttl = 100.0 )
     # Exactly at boundary - not expired (uses > not >=)
-    entry_exact = module.CacheEntry( timestamp = 900.0, ttl = 100.0 )
-    assert not entry_exact.invalid
+    assert not entry.invalid( 1000.0 )
     # Just past boundary - expired
-    mock_time.return_value = 1000.1
-    entry_past = module.CacheEntry( timestamp = 900.0, ttl = 100.0 )
-    assert entry_past.invalid
+    assert entry.invalid( 1000.1 )
 
 
 def test_015_content_cache_entry_memory_usage( ):
     ''' Memory usage calculation includes overhead. '''
-    response = _generics.Value( b'test content' )
-    headers = _httpx.Headers( { 'content-type': 'text/plain' } )
+    response = _RESPONSE_TEST_CONTENT
+    headers = _HEADERS_TEXT_PLAIN
     entry = module.ContentCacheEntry(
         response = response,
         headers = headers,
@@ -177,7 +240,7 @@ def test_015_content_cache_entry_memory_usage( ):
 
 def test_016_probe_cache_entry_basic_construction( ):
     ''' Probe entries construct with required fields. '''
-    response = _generics.Value( True )
+    response = _RESPONSE_TRUE
     entry = module.ProbeCacheEntry(
         response = response,
         timestamp = 1000.0,
@@ -187,68 +250,39 @@ def test_016_probe_cache_entry_basic_construction( ):
     assert entry.ttl == 300.0
 
 
-def test_030_extract_charset_from_headers_with_charset( ):
-    ''' Charset is extracted from Content-Type headers. '''
-    headers = _httpx.Headers( {
-        'content-type': 'text/html; charset=iso-8859-1',
-    } )
-    result = module._extract_charset_from_headers( headers, 'utf-8' )
-    assert result == 'iso-8859-1'
-
-
-def test_031_extract_charset_from_headers_with_quotes( ):
-    ''' Quoted charset values are handled correctly. '''
-    headers = _httpx.Headers( {
-        'content-type': 'text/html; charset="utf-16"',
-    } )
-    result = module._extract_charset_from_headers( headers, 'utf-8' )
-    assert result == 'utf-16'
-
-
-def test_032_extract_charset_from_headers_no_charset( ):
-    ''' Default charset is returned when none specified. '''
-    headers = _httpx.Headers( { 'content-type': 'text/html' } )
-    result = module._extract_charset_from_headers( headers, 'utf-8' )
-    assert result == 'utf-8'
-
-
-def test_033_extract_charset_from_headers_missing_header( ):
-    ''' Default charset is returned when header is missing. '''
-    headers = _httpx.Headers( )
-    result = module._extract_charset_from_headers( headers, 'utf-8' )
-    assert result == 'utf-8'
-
-
-def test_034_extract_charset_from_headers_with_semicolon_no_charset( ):
-    ''' Default charset returned when semicolon present but no charset. '''
-    headers = _httpx.Headers( {
-        'content-type': 'text/html; boundary=something'
-    } )
+@pytest.mark.parametrize(
+    'headers, expected',
+    (
+        ( _HEADERS_HTML_ISO, 'iso-8859-1' ),
+        ( _HEADERS_HTML_UTF16_Q, 'utf-16' ),
+        ( _HEADERS_TEXT_HTML, 'utf-8' ),
+        ( _HEADERS_EMPTY, 'utf-8' ),
+        ( _HEADERS_HTML_BOUNDARY, 'utf-8' ),
+        ( _HEADERS_HTML_PARAMS, 'UTF-8' ),
+    ),
+    ids = (
+        'with-charset', 'quoted-charset', 'no-charset', 'missing-header',
+        'semicolon-no-charset', 'spaced-charset-with-params' )
+)
+def test_030_extract_charset_from_headers( headers, expected ):
+    ''' Charset is extracted from headers or defaulted when absent. '''
     result = module._extract_charset_from_headers( headers, 'utf-8' )
-    assert result == 'utf-8'
-
-
-def test_035_extract_mimetype_from_headers_with_params( ):
-    ''' Mimetype is extracted before parameters. '''
-    headers = _httpx.Headers( {
-        'content-type': 'application/json; charset=utf-8',
-    } )
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    'headers, expected',
+    (
+        ( _HEADERS_APP_JSON, 'application/json' ),
+        ( _HEADERS_TEXT_PLAIN, 'text/plain' ),
+        ( _HEADERS_EMPTY, '' ),
+    ),
+    ids = ( 'with-params', 'no-params', 'missing-header' )
+)
+def test_035_extract_mimetype_from_headers( headers, expected ):
+    ''' Mimetype is extracted from headers without parameters. '''
     result = module._extract_mimetype_from_headers( headers )
-    assert result == 'application/json'
-
-
-def test_036_extract_mimetype_from_headers_no_params( ):
-    ''' Full mimetype value is returned without parameters. '''
-    headers = _httpx.Headers( { 'content-type': 'text/plain' } )
-    result = module._extract_mimetype_from_headers( headers )
-    assert result == 'text/plain'
-
-
-def test_037_extract_mimetype_from_headers_missing_header( ):
-    ''' Empty string is returned when mimetype header is missing. '''
-    headers = _httpx.Headers( )
-    result = module._extract_mimetype_from_headers( headers )
-    assert result == ''
+    assert result == expected
 
 
 #
@@ -277,20 +311,22 @@ def test_100_content_cache_initialization( test_delay_fn, robots_cache ):
 async def test_110_content_cache_access_missing_returns_absent(
         content_cache ):
     ''' Missing URLs return absent from cache access. '''
-    result = await content_cache.access( _URL_HTTP_MISSING.geturl( ) )
+    result = await content_cache.access( _URL_HTTP_MISSING_S )
     assert __.is_absent( result )
 
 
 @pytest.mark.asyncio
-async def test_111_content_cache_access_fresh_returns_content( content_cache ):
+async def test_111_content_cache_access_fresh_returns_content(
+    content_cache, test_clock
+):
     ''' Fresh entries return content and headers from cache access. '''
     test_content = b'test content'
-    response = _generics.Value( test_content )
-    with patch.object( module.__.time, 'time', return_value = 1000.0 ):
-        await content_cache.store(
-            _URL_HTTP_TEST.geturl( ), response, _HEADERS_TEXT_PLAIN, 300.0 )
-    with patch.object( module.__.time, 'time', return_value = 1100.0 ):
-        result = await content_cache.access( _URL_HTTP_TEST.geturl( ) )
+    response = _RESPONSE_TEST_CONTENT
+    test_clock.now = 1000.0
+    await content_cache.store(
+        _URL_HTTP_TEST_S, response, _HEADERS_TEXT_PLAIN, 300.0 )
+    test_clock.now = 1100.0
+    result = await content_cache.access( _URL_HTTP_TEST_S )
     assert not __.is_absent( result )
     content, headers = result
     assert content == test_content
@@ -299,17 +335,16 @@ async def test_111_content_cache_access_fresh_returns_content( content_cache ):
 
 @pytest.mark.asyncio
 async def test_112_content_cache_access_expired_returns_absent(
-        content_cache
+    content_cache, test_clock
 ):
     ''' Expired entries are removed and return absent from cache access. '''
-    test_content = b'test content'
-    response = _generics.Value( test_content )
-    url_key = _URL_HTTP_TEST.geturl( )
-    with patch.object( module.__.time, 'time', return_value = 1000.0 ):
-        await content_cache.store(
-            url_key, response, _HEADERS_TEXT_PLAIN, 300.0 )
-    with patch.object( module.__.time, 'time', return_value = 2000.0 ):
-        result = await content_cache.access( url_key )
+    response = _RESPONSE_TEST_CONTENT
+    url_key = _URL_HTTP_TEST_S
+    test_clock.now = 1000.0
+    await content_cache.store(
+        url_key, response, _HEADERS_TEXT_PLAIN, 300.0 )
+    test_clock.now = 2000.0
+    result = await content_cache.access( url_key )
     assert __.is_absent( result )
     assert url_key not in content_cache._cache
 
@@ -329,7 +364,7 @@ def test_121_content_cache_determine_ttl_error( test_delay_fn, robots_cache ):
     cache = module.ContentCache(
         robots_cache = robots_cache, error_ttl = 45.0,
         delay_function = test_delay_fn )
-    response = _generics.Error( Exception( 'test error' ) )
+    response = _RESPONSE_ERROR
     ttl = cache.determine_ttl( response )
     assert ttl == 45.0
 
@@ -339,13 +374,12 @@ async def test_130_content_cache_store_tracks_memory( content_cache ):
     ''' Storing entries updates memory tracking correctly. '''
     test_content = b'test content 12 bytes'
     response = _generics.Value( test_content )
-    headers = _httpx.Headers( )
-    url_key = _URL_HTTP_TEST.geturl( )
-    with patch.object( module.__.time, 'time', return_value = 1000.0 ):
-        await content_cache.store( url_key, response, headers, 300.0 )
+    headers = _HEADERS_EMPTY
+    url_key = _URL_HTTP_TEST_S
+    await content_cache.store( url_key, response, headers, 300.0 )
     assert content_cache._memory_total == 121  # 21 bytes + 100 overhead
     assert url_key in content_cache._cache
-    assert list( content_cache._recency ) == [ url_key ]
+    assert tuple( content_cache._recency ) == ( url_key, )
 
 
 @pytest.mark.asyncio
@@ -353,16 +387,14 @@ async def test_131_content_cache_store_replaces_existing( content_cache ):
     ''' Storing replaces existing entries and updates memory. '''
     content1 = b'first'
     response1 = _generics.Value( content1 )
-    headers1 = _httpx.Headers( )
-    url_key = _URL_HTTP_TEST.geturl( )
-    with patch.object( module.__.time, 'time', return_value = 1000.0 ):
-        await content_cache.store( url_key, response1, headers1, 300.0 )
+    headers1 = _HEADERS_EMPTY
+    url_key = _URL_HTTP_TEST_S
+    await content_cache.store( url_key, response1, headers1, 300.0 )
     # Store second entry with same URL
     content2 = b'second content longer'
     response2 = _generics.Value( content2 )
-    with patch.object( module.__.time, 'time', return_value = 1100.0 ):
-        await content_cache.store(
-            url_key, response2, _HEADERS_TEXT_HTML, 300.0 )
+    await content_cache.store(
+        url_key, response2, _HEADERS_TEXT_HTML, 300.0 )
     assert len( content_cache._cache ) == 1
     entry = content_cache._cache[ url_key ]
     assert entry.response.extract( ) == content2
@@ -376,13 +408,11 @@ async def test_132_content_cache_eviction_by_memory( test_delay_fn ):
     cache = module.ContentCache(
         memory_max = 300, delay_function = test_delay_fn )
     # Store multiple entries that will exceed memory limit
+    content = b'x' * 50  # 50 bytes each + 100 overhead = 150 each
+    response = _generics.Value( content )
     for i in range( 5 ):
-        content = b'x' * 50  # 50 bytes each + 100 overhead = 150 each
-        response = _generics.Value( content )
-        headers = _httpx.Headers( )
         url = f'http://example.com/test{i}'
-        with patch.object( module.__.time, 'time', return_value = 1000.0 + i ):
-            await cache.store( url, response, headers, 300.0 )
+        await cache.store( url, response, _HEADERS_EMPTY, 300.0 )
     # Should have evicted oldest entries to stay under 300 bytes
     assert cache._memory_total <= 300
     assert len( cache._cache ) == 2  # Only last 2 entries fit
@@ -396,22 +426,81 @@ async def test_133_content_cache_record_access_updates_lru( test_delay_fn ):
     ''' Accessing entries moves URLs to end of recency queue. '''
     cache = module.ContentCache( delay_function = test_delay_fn )
     # Store multiple entries
+    response = _generics.Value( b'test' )
     for i in range( 3 ):
-        content = b'test'
-        response = _generics.Value( content )
-        headers = _httpx.Headers( )
         url = f'http://example.com/test{i}'
-        with patch.object( module.__.time, 'time', return_value = 1000.0 + i ):
-            await cache.store( url, response, headers, 300.0 )
+        await cache.store( url, response, _HEADERS_EMPTY, 300.0 )
     # Access middle entry
-    with patch.object( module.__.time, 'time', return_value = 1100.0 ):
-        await cache.access( 'http://example.com/test1' )
+    await cache.access( 'http://example.com/test1' )
     # Should have moved test1 to end
-    assert list( cache._recency ) == [
+    assert tuple( cache._recency ) == (
         'http://example.com/test0',
         'http://example.com/test2',
-        'http://example.com/test1'
-    ]
+        'http://example.com/test1' )
+
+
+@pytest.mark.asyncio
+async def test_134_content_cache_eviction_spares_popular_entry(
+    test_delay_fn
+):
+    ''' Newest entry is evicted when LRU entry is more popular. '''
+    cache = module.ContentCache(
+        memory_max = 300, delay_function = test_delay_fn )
+    response = _generics.Value( b'x' * 50 )
+    popular_url = 'http://example.com/popular'
+    await cache.store( popular_url, response, _HEADERS_EMPTY, 300.0 )
+    await cache.access( popular_url )
+    await cache.access( popular_url )
+    await cache.store(
+        'http://example.com/recent', response, _HEADERS_EMPTY, 300.0 )
+    await cache.store(
+        'http://example.com/oneoff', response, _HEADERS_EMPTY, 300.0 )
+    assert popular_url in cache._cache
+    assert 'http://example.com/oneoff' not in cache._cache
+    assert cache._memory_total <= 300
+
+
+def test_135_frequency_sketch_ages_counts( ):
+    ''' Frequency counts halve after each sample of additions. '''
+    sketch = module.FrequencySketch( sample_size = 4 )
+    for _ in range( 3 ): sketch.increment( 'popular' )
+    assert sketch.estimate( 'popular' ) == 3
+    sketch.increment( 'oneoff' )
+    assert sketch.estimate( 'popular' ) == 1
+    assert sketch.estimate( 'oneoff' ) == 0
+    assert 'oneoff' not in sketch._counts
+
+
+@pytest.mark.asyncio
+async def test_136_content_cache_eviction_lru_after_newest_rejected(
+    test_delay_fn
+):
+    ''' Eviction falls back to LRU order once newest entry is evicted. '''
+    cache = module.ContentCache(
+        memory_max = 600, delay_function = test_delay_fn )
+    response = _generics.Value( b'x' * 50 )
+    popular_url = 'http://example.com/popular'
+    await cache.store( popular_url, response, _HEADERS_EMPTY, 300.0 )
+    await cache.access( popular_url )
+    for name in ( 'recent1', 'recent2', 'newest' ):
+        await cache.store(
+            f'http://example.com/{name}', response, _HEADERS_EMPTY, 300.0 )
+    cache._memory_total += 300
+    cache._evict_by_memory( )
+    assert set( cache._cache ) == {
+        'http://example.com/recent1', 'http://example.com/recent2' }
+
+
+@pytest.mark.asyncio
+async def test_137_content_cache_misses_not_counted( test_delay_fn ):
+    ''' Only hits and stored entries count towards popularity. '''
+    cache = module.ContentCache( delay_function = test_delay_fn )
+    url = 'http://example.com/test'
+    assert __.is_absent( await cache.access( url ) )
+    assert url not in cache._frequencies._counts
+    await cache.store( url, _generics.Value( b'x' ), _HEADERS_EMPTY, 300.0 )
+    await cache.access( url )
+    assert cache._frequencies.estimate( url ) == 2
 
 
 #
@@ -431,38 +520,41 @@ def test_150_probe_cache_initialization( test_delay_fn ):
     assert cache.success_ttl == 600.0
     assert cache.delay_function == test_delay_fn
     assert len( cache._cache ) == 0
-    assert len( cache._recency ) == 0
 
 
 @pytest.mark.asyncio
 async def test_160_probe_cache_access_missing_returns_absent( probe_cache ):
     ''' Missing URLs return absent from probe cache access. '''
-    result = await probe_cache.access( _URL_HTTP_MISSING.geturl( ) )
+    result = await probe_cache.access( _URL_HTTP_MISSING_S )
     assert __.is_absent( result )
 
 
 @pytest.mark.asyncio
-async def test_161_probe_cache_access_fresh_returns_result( probe_cache ):
+async def test_161_probe_cache_access_fresh_returns_result(
+    probe_cache, test_clock
+):
     ''' Fresh entries return probe results from cache access. '''
-    response = _generics.Value( True )
-    url_key = _URL_HTTP_TEST.geturl( )
-    with patch.object( module.__.time, 'time', return_value = 1000.0 ):
-        await probe_cache.store( url_key, response, 300.0 )
-    with patch.object( module.__.time, 'time', return_value = 1100.0 ):
-        result = await probe_cache.access( url_key )
+    response = _RESPONSE_TRUE
+    url_key = _URL_HTTP_TEST_S
+    test_clock.now = 1000.0
+    await probe_cache.store( url_key, response, 300.0 )
+    test_clock.now = 1100.0
+    result = await probe_cache.access( url_key )
     assert not __.is_absent( result )
     assert result is True
 
 
 @pytest.mark.asyncio
-async def test_162_probe_cache_access_expired_returns_absent( probe_cache ):
+async def test_162_probe_cache_access_expired_returns_absent(
+    probe_cache, test_clock
+):
     ''' Expired entries are removed and return absent from probe cache. '''
     response = _generics.Value( False )
-    url_key = _URL_HTTP_TEST.geturl( )
-    with patch.object( module.__.time, 'time', return_value = 1000.0 ):
-        await probe_cache.store( url_key, response, 300.0 )
-    with patch.object( module.__.time, 'time', return_value = 2000.0 ):
-        result = await probe_cache.access( url_key )
+    url_key = _URL_HTTP_TEST_S
+    test_clock.now = 1000.0
+    await probe_cache.store( url_key, response, 300.0 )
+    test_clock.now = 2000.0
+    result = await probe_cache.access( url_key )
     assert __.is_absent( result )
     assert url_key not in probe_cache._cache
 
@@ -471,7 +563,7 @@ def test_170_probe_cache_determine_ttl_success( test_delay_fn ):
     ''' Successful probe responses get appropriate TTL. '''
     cache = module.ProbeCache(
         success_ttl = 456.0, delay_function = test_delay_fn )
-    response = _generics.Value( True )
+    response = _RESPONSE_TRUE
     ttl = cache.determine_ttl( response )
     assert ttl == 456.0
 
@@ -480,22 +572,22 @@ def test_171_probe_cache_determine_ttl_error( test_delay_fn ):
     ''' Error probe responses get appropriate TTL. '''
     cache = module.ProbeCache(
         error_ttl = 78.0, delay_function = test_delay_fn )
-    response = _generics.Error( Exception( 'test error' ) )
+    response = _RESPONSE_ERROR
     ttl = cache.determine_ttl( response )
     assert ttl == 78.0
 
 
 @pytest.mark.asyncio
-async def test_172_probe_cache_store_updates_recency( test_delay_fn ):
-    ''' Storing probe entries updates recency tracking correctly. '''
+async def test_172_probe_cache_store_reinserts_as_newest( test_delay_fn ):
+    ''' Storing existing probe entry moves it to end of eviction order. '''
     cache = module.ProbeCache( delay_function = test_delay_fn )
-    response = _generics.Value( True )
-
-    with patch.object( module.__.time, 'time', return_value = 1000.0 ):
-        await cache.store( 'http://example.com/test', response, 300.0 )
-
-    assert 'http://example.com/test' in cache._cache
-    assert list( cache._recency ) == [ 'http://example.com/test' ]
+    response = _RESPONSE_TRUE
+    for i in range( 2 ):
+        url = f'http://example.com/test{i}'
+        await cache.store( url, response, 300.0 )
+    await cache.store( 'http://example.com/test0', response, 300.0 )
+    assert tuple( cache._cache ) == (
+        'http://example.com/test1', 'http://example.com/test0' )
 
 
 @pytest.mark.asyncio
@@ -507,8 +599,7 @@ async def test_173_probe_cache_eviction_by_count( test_delay_fn ):
     for i in range( 5 ):
         response = _generics.Value( i % 2 == 0 )  # Alternating True/False
         url = f'http://example.com/test{i}'
-        with patch.object( module.__.time, 'time', return_value = 1000.0 + i ):
-            await cache.store( url, response, 300.0 )
+        await cache.store( url, response, 300.0 )
     # Should have evicted oldest entries to stay under limit
     assert len( cache._cache ) == 3
     assert 'http://example.com/test2' in cache._cache
@@ -519,22 +610,23 @@ async def test_173_probe_cache_eviction_by_count( test_delay_fn ):
 
 
 @pytest.mark.asyncio
-async def test_174_probe_cache_record_access_updates_lru( test_delay_fn ):
-    ''' Accessing probe entries moves URLs to end of recency queue. '''
-    cache = module.ProbeCache( delay_function = test_delay_fn )
+async def test_174_probe_cache_access_keeps_insertion_order(
+    test_delay_fn
+):
+    ''' Accessing probe entries does not change eviction order. '''
+    cache = module.ProbeCache(
+        entries_max = 3, delay_function = test_delay_fn )
+    response = _RESPONSE_TRUE
     for i in range( 3 ):
-        response = _generics.Value( True )
         url = f'http://example.com/test{i}'
-        with patch.object( module.__.time, 'time', return_value = 1000.0 + i ):
-            await cache.store( url, response, 300.0 )
-    with patch.object( module.__.time, 'time', return_value = 1100.0 ):
-        await cache.access( 'http://example.com/test0' )
-    # Should have moved test0 to end
-    assert list( cache._recency ) == [
+        await cache.store( url, response, 300.0 )
+    assert await cache.access( 'http://example.com/test0' ) is True
+    await cache.store( 'http://example.com/test3', response, 300.0 )
+    assert 'http://example.com/test0' not in cache._cache
+    assert tuple( cache._cache ) == (
         'http://example.com/test1',
         'http://example.com/test2',
-        'http://example.com/test0'
-    ]
+        'http://example.com/test3' )
 
 
 #
@@ -543,25 +635,36 @@ async def test_174_probe_cache_record_access_updates_lru( test_delay_fn ):
 
 
 @pytest.mark.asyncio
-async def test_200_probe_url_file_scheme_existing_file( fs, probe_cache, robots_cache ):
+async def test_200_probe_url_file_scheme_existing_file(
+    tmp_path, probe_cache, robots_cache
+):
     ''' Existing file URLs return True when probed. '''
-    fs.create_file( '/test/file.txt', contents = 'test content' )
-    result = await module.probe_url( probe_cache, _URL_FILE_TEST )
+    location = tmp_path / 'file.txt'
+    location.write_text( 'test content' )
+    result = await module.probe_url(
+        probe_cache, _produce_file_url( location ) )
     assert result is True
 
 
 @pytest.mark.asyncio
-async def test_201_probe_url_file_scheme_missing_file( fs, probe_cache, robots_cache ):
+async def test_201_probe_url_file_scheme_missing_file(
+    tmp_path, probe_cache, robots_cache
+):
     ''' Missing file URLs return False when probed. '''
-    result = await module.probe_url( probe_cache, _URL_FILE_MISSING )
+    result = await module.probe_url(
+        probe_cache, _produce_file_url( tmp_path / 'missing.txt' ) )
     assert result is False
 
 
 @pytest.mark.asyncio
-async def test_202_probe_url_empty_scheme_existing_file( fs, probe_cache, robots_cache ):
+async def test_202_probe_url_empty_scheme_existing_file(
+    tmp_path, probe_cache, robots_cache
+):
     ''' Empty schemes are handled as file paths when probing. '''
-    fs.create_file( '/test/file.txt', contents = 'test content' )
-    result = await module.probe_url( probe_cache, _URL_EMPTY_SCHEME )
+    location = tmp_path / 'file.txt'
+    location.write_text( 'test content' )
+    result = await module.probe_url(
+        probe_cache, _produce_file_url( location, scheme = '' ) )
     assert result is True
 
 
@@ -575,12 +678,10 @@ async def test_203_probe_url_unsupported_scheme_returns_false( probe_cache, robo
 @pytest.mark.asyncio
 async def test_210_probe_url_http_cache_hit_returns_cached( robots_cache ):
     ''' Cache hits return cached probe results. '''
-    mock_cache = Mock( spec = module.ProbeCache )
-    mock_cache.access.return_value = True
-    result = await module.probe_url(
-        mock_cache, _URL_HTTP_TEST )
+    stub_cache = _StubCache( True )
+    result = await module.probe_url( stub_cache, _URL_HTTP_TEST )
     assert result is True
-    mock_cache.access.assert_called_once_with( _URL_HTTP_TEST.geturl( ) )
+    assert stub_cache.accesses == [ _URL_HTTP_TEST_S ]
 
 
 @pytest.mark.asyncio
@@ -598,13 +699,13 @@ async def test_211_probe_url_http_cache_miss_success(
 
 
 @pytest.mark.asyncio
-async def test_212_probe_url_http_cache_miss_failure( probe_cache, robots_cache ):
+async def test_212_probe_url_http_cache_miss_failure(
+    probe_cache, robots_cache, mock_client_factory
+):
     ''' HTTP cache miss handles HEAD request exceptions with graceful robots.txt degradation. '''
     def handler( request ):
         raise _httpx.TimeoutException( 'Timeout' )
-    mock_transport = _httpx.MockTransport( handler )
-    def client_factory( ):
-        return _httpx.AsyncClient( transport = mock_transport )
+    client_factory = mock_client_factory( handler = handler )
     # With graceful degradation, robots.txt timeout should not propagate
     # The actual HEAD request timeout should still be raised
     with pytest.raises( _httpx.TimeoutException ):
@@ -671,33 +772,38 @@ async def test_222_probe_url_mutex_reuse_sequential_requests( robots_cache ):
 
 
 @pytest.mark.asyncio
-async def test_300_retrieve_url_file_scheme_existing_file( fs, content_cache, robots_cache ):
+async def test_300_retrieve_url_file_scheme_existing_file(
+    tmp_path, content_cache, robots_cache
+):
     ''' Existing file URLs return content when retrieved. '''
     test_content = b'file content for testing'
-    fs.create_file( '/test/data.txt', contents = test_content )
-    url_data = Url(
-        scheme = 'file', netloc = '', path = '/test/data.txt',
-        params = '', query = '', fragment = '' )
-    result = await module.retrieve_url( content_cache, url_data )
+    location = tmp_path / 'data.txt'
+    location.write_bytes( test_content )
+    result = await module.retrieve_url(
+        content_cache, _produce_file_url( location ) )
     assert result == test_content
 
 
 @pytest.mark.asyncio
-async def test_301_retrieve_url_file_scheme_missing_file( fs, content_cache, robots_cache ):
+async def test_301_retrieve_url_file_scheme_missing_file(
+    tmp_path, content_cache, robots_cache
+):
     ''' Missing files raise DocumentationInaccessibility when retrieved. '''
+    url = _produce_file_url( tmp_path / 'missing.txt' )
     with pytest.raises( _exceptions.DocumentationInaccessibility ):
-        await module.retrieve_url( content_cache, _URL_FILE_MISSING )
+        await module.retrieve_url( content_cache, url )
 
 
 @pytest.mark.asyncio
-async def test_302_retrieve_url_empty_scheme_existing_file( fs, content_cache, robots_cache ):
+async def test_302_retrieve_url_empty_scheme_existing_file(
+    tmp_path, content_cache, robots_cache
+):
     ''' Empty schemes are handled as file paths when retrieving. '''
     test_content = b'empty scheme content'
-    fs.create_file( '/test/data.txt', contents = test_content )
-    url = Url(
-        scheme = '', netloc = '', path = '/test/data.txt',
-        params = '', query = '', fragment = '' )
-    result = await module.retrieve_url( content_cache, url )
+    location = tmp_path / 'data.txt'
+    location.write_bytes( test_content )
+    result = await module.retrieve_url(
+        content_cache, _produce_file_url( location, scheme = '' ) )
     assert result == test_content
 
 
@@ -711,16 +817,17 @@ async def test_303_retrieve_url_unsupported_scheme_raises_exception( content_cac
 @pytest.mark.asyncio
 async def test_310_retrieve_url_http_cache_hit_returns_cached( robots_cache ):
     ''' Cache hits return cached content when retrieving. '''
-    mock_cache = Mock( spec = module.ContentCache )
     test_content = b'cached content'
-    mock_cache.access.return_value = ( test_content, _HEADERS_TEXT_PLAIN )
-    result = await module.retrieve_url( mock_cache, _URL_HTTP_TEST )
+    stub_cache = _StubCache( ( test_content, _HEADERS_TEXT_PLAIN ) )
+    result = await module.retrieve_url( stub_cache, _URL_HTTP_TEST )
     assert result == test_content
-    mock_cache.access.assert_called_once_with( _URL_HTTP_TEST.geturl( ) )
+    assert stub_cache.accesses == [ _URL_HTTP_TEST_S ]
 
 
 @pytest.mark.asyncio
-async def test_311_retrieve_url_http_cache_miss( robots_cache ):
+async def test_311_retrieve_url_http_cache_miss(
+    robots_cache, mock_client_factory
+):
     ''' HTTP cache miss for retrieval executes GET and caches result. '''
     cache = module.ContentCache( )
     test_content = b'HTTP response content for cache miss test'
@@ -732,9 +839,7 @@ async def test_311_retrieve_url_http_cache_miss( robots_cache ):
         return _httpx.Response(
             200, content = test_content,
             headers = { 'content-type': 'application/octet-stream' } )
-    mock_transport = _httpx.MockTransport( handler )
-    def client_factory( ):
-        return _httpx.AsyncClient( transport = mock_transport )
+    client_factory = mock_client_factory( handler = handler )
     result = await module.retrieve_url(
         cache, url, client_factory = client_factory )
     assert result == test_content
@@ -755,15 +860,16 @@ async def test_312_retrieve_url_file_permission_error_raises_exception( content_
 
 
 @pytest.mark.asyncio
-async def test_320_retrieve_url_dependency_injection_with_custom_cache( fs, robots_cache ):
+async def test_320_retrieve_url_dependency_injection_with_custom_cache(
+    tmp_path, robots_cache
+):
     ''' Injected cache dependencies are accepted for retrieval. '''
     custom_cache = module.ContentCache( memory_max = 2048 )
     test_content = b'custom cache test content'
-    fs.create_file( '/test/custom.txt', contents = test_content )
-    url = Url(
-        scheme = 'file', netloc = '', path = '/test/custom.txt',
-        params = '', query = '', fragment = '' )
-    result = await module.retrieve_url( custom_cache, url )
+    location = tmp_path / 'custom.txt'
+    location.write_bytes( test_content )
+    result = await module.retrieve_url(
+        custom_cache, _produce_file_url( location ) )
     assert result == test_content
     assert custom_cache.memory_max == 2048
 
@@ -805,77 +911,73 @@ async def test_351_retrieve_url_as_text_unsupported_scheme_raises_exception( con
 
 
 @pytest.mark.asyncio
-async def test_360_retrieve_url_as_text_file_scheme_utf8( fs, content_cache, robots_cache ):
+async def test_360_retrieve_url_as_text_file_scheme_utf8(
+    tmp_path, content_cache, robots_cache
+):
     ''' UTF-8 files return decoded content as text. '''
     test_content = 'UTF-8 text content with émojis 🚀'
-    fs.create_file(
-        '/test/utf8.txt', contents = test_content, encoding = 'utf-8' )
-    url = Url(
-        scheme = 'file', netloc = '', path = '/test/utf8.txt',
-        params = '', query = '', fragment = '' )
-    result = await module.retrieve_url_as_text( content_cache, url )
+    location = tmp_path / 'utf8.txt'
+    location.write_text( test_content, encoding = 'utf-8' )
+    result = await module.retrieve_url_as_text(
+        content_cache, _produce_file_url( location ) )
     assert result == test_content
 
 
 @pytest.mark.asyncio
-async def test_361_retrieve_url_as_text_file_scheme_custom_charset( fs, content_cache, robots_cache ):
+async def test_361_retrieve_url_as_text_file_scheme_custom_charset(
+    tmp_path, content_cache, robots_cache
+):
     ''' Custom default charset is used for file text retrieval. '''
     test_content = 'ASCII content only'
-    fs.create_file(
-        '/test/ascii.txt', contents = test_content.encode( 'ascii' ) )
-    url = Url(
-        scheme = 'file', netloc = '', path = '/test/ascii.txt',
-        params = '', query = '', fragment = '' )
+    location = tmp_path / 'ascii.txt'
+    location.write_bytes( test_content.encode( 'ascii' ) )
     result = await module.retrieve_url_as_text(
-        content_cache, url, charset_default = 'ascii' )
+        content_cache, _produce_file_url( location ),
+        charset_default = 'ascii' )
     assert result == test_content
 
 
 @pytest.mark.asyncio
 async def test_362_retrieve_url_as_text_http_cache_hit_with_charset( robots_cache ):
     ''' Cache hits extract charset from headers for text retrieval. '''
-    mock_cache = Mock( spec = module.ContentCache )
     test_content = 'Cached text content'
-    test_headers = _httpx.Headers( {
-        'content-type': 'text/html; charset=iso-8859-1',
-    } )
-    mock_cache.access.return_value = (
-        test_content.encode( 'iso-8859-1' ), test_headers )
+    test_headers = _HEADERS_HTML_ISO
+    stub_cache = _StubCache(
+        ( test_content.encode( 'iso-8859-1' ), test_headers ) )
     result = await module.retrieve_url_as_text(
-        mock_cache, _URL_HTTP_TEST )
+        stub_cache, _URL_HTTP_TEST )
     assert result == test_content
-    mock_cache.access.assert_called_once_with( _URL_HTTP_TEST.geturl( ) )
+    assert stub_cache.accesses == [ _URL_HTTP_TEST_S ]
 
 
 @pytest.mark.asyncio
 async def test_363_retrieve_url_as_text_http_validates_content_type( robots_cache ):
     ''' Textual content type is validated for text retrieval. '''
-    mock_cache = Mock( spec = module.ContentCache )
-    mock_cache.access.return_value = ( b'binary data', _HEADERS_IMAGE_PNG )
+    stub_cache = _StubCache( ( b'binary data', _HEADERS_IMAGE_PNG ) )
     url_image = Url(
         scheme = 'http', netloc = 'example.com', path = '/image',
         params = '', query = '', fragment = '' )
     with pytest.raises( _exceptions.HttpContentTypeInvalidity ):
-        await module.retrieve_url_as_text( mock_cache, url_image )
+        await module.retrieve_url_as_text( stub_cache, url_image )
 
 
 @pytest.mark.asyncio
 async def test_364_retrieve_url_as_text_http_default_charset_fallback( robots_cache ):
     ''' Default charset is used as fallback when none specified. '''
-    mock_cache = Mock( spec = module.ContentCache )
     test_content = 'Default charset content'
-    test_headers = _httpx.Headers( { 'content-type': 'text/plain' } )
-    mock_cache.access.return_value = (
-        test_content.encode( 'utf-8' ), test_headers )
+    test_headers = _HEADERS_TEXT_PLAIN
+    stub_cache = _StubCache( ( test_content.encode( 'utf-8' ), test_headers ) )
     url = Url(
         scheme = 'http', netloc = 'example.com', path = '/text',
         params = '', query = '', fragment = '' )
-    result = await module.retrieve_url_as_text( mock_cache, url )
+    result = await module.retrieve_url_as_text( stub_cache, url )
     assert result == test_content
 
 
 @pytest.mark.asyncio
-async def test_365_retrieve_url_as_text_http_cache_miss( robots_cache ):
+async def test_365_retrieve_url_as_text_http_cache_miss(
+    robots_cache, mock_client_factory
+):
     ''' HTTP cache miss for text retrieval executes GET and caches result. '''
     cache = module.ContentCache( )
     test_content = 'HTTP text response'
@@ -886,9 +988,7 @@ async def test_365_retrieve_url_as_text_http_cache_miss( robots_cache ):
         return _httpx.Response(
             200, content = test_content.encode( 'utf-8' ),
             headers = { 'content-type': 'text/plain; charset=utf-8' } )
-    mock_transport = _httpx.MockTransport( handler )
-    def client_factory( ):
-        return _httpx.AsyncClient( transport = mock_transport )
+    client_factory = mock_client_factory( handler = handler )
     result = await module.retrieve_url_as_text(
         cache, url, client_factory = client_factory )
     assert result == test_content
@@ -896,10 +996,13 @@ async def test_365_retrieve_url_as_text_http_cache_miss( robots_cache ):
     assert not __.is_absent( cached_result )
     cached_content, _ = cached_result
     assert cached_content.decode( 'utf-8' ) == test_content
+    assert cache.access_charset( url.geturl( ) ) == 'utf-8'
 
 
 @pytest.mark.asyncio
-async def test_366_retrieve_url_as_text_http_cache_miss_custom_charset( robots_cache ):
+async def test_366_retrieve_url_as_text_http_cache_miss_custom_charset(
+    robots_cache, mock_client_factory
+):
     ''' HTTP cache miss for text with custom charset decodes correctly. '''
     cache = module.ContentCache( )
     test_content = 'Custom charset content'
@@ -910,9 +1013,7 @@ async def test_366_retrieve_url_as_text_http_cache_miss_custom_charset( robots_c
         return _httpx.Response(
             200, content = test_content.encode( 'iso-8859-1' ),
             headers = { 'content-type': 'text/plain; charset=iso-8859-1' } )
-    mock_transport = _httpx.MockTransport( handler )
-    def client_factory( ):
-        return _httpx.AsyncClient( transport = mock_transport )
+    client_factory = mock_client_factory( handler = handler )
     result = await module.retrieve_url_as_text(
         cache, url, client_factory = client_factory )
     assert result == test_content
@@ -923,15 +1024,32 @@ async def test_366_retrieve_url_as_text_http_cache_miss_custom_charset( robots_c
 
 
 @pytest.mark.asyncio
-async def test_370_retrieve_url_as_text_dependency_injection( fs, robots_cache ):
+async def test_367_retrieve_url_as_text_reuses_recorded_charset(
+    content_cache
+):
+    ''' Cache hits with recorded charset skip content validation. '''
+    url_s = _URL_HTTP_TEST_S
+    await content_cache.store(
+        url_s, _generics.Value( 'caf\u00e9'.encode( 'iso-8859-1' ) ),
+        _HEADERS_IMAGE_PNG, 300.0 )
+    assert __.is_absent( content_cache.access_charset( url_s ) )
+    content_cache.assign_charset( url_s, 'iso-8859-1' )
+    result = await module.retrieve_url_as_text( content_cache, _URL_HTTP_TEST )
+    assert result == 'caf\u00e9'
+    assert content_cache.access_charset( url_s ) == 'iso-8859-1'
+
+
+@pytest.mark.asyncio
+async def test_370_retrieve_url_as_text_dependency_injection(
+    tmp_path, robots_cache
+):
     ''' Injected cache dependencies are accepted for text retrieval. '''
     custom_cache = module.ContentCache( memory_max = 1024 )
     test_content = 'Custom text content'
-    fs.create_file( '/test/text.txt', contents = test_content )
-    url = Url(
-        scheme = 'file', netloc = '', path = '/test/text.txt',
-        params = '', query = '', fragment = '' )
-    result = await module.retrieve_url_as_text( custom_cache, url )
+    location = tmp_path / 'text.txt'
+    location.write_text( test_content, encoding = 'utf-8' )
+    result = await module.retrieve_url_as_text(
+        custom_cache, _produce_file_url( location ) )
     assert result == test_content
     assert custom_cache.memory_max == 1024
 
@@ -968,20 +1086,17 @@ def test_802_content_cache_remove_missing_entry( ):
     assert len( cache._cache ) == 0
 
 
-def test_803_probe_cache_evict_empty_recency_queue( ):
-    ''' Count eviction handles empty recency queue gracefully. '''
-    cache = module.ProbeCache( entries_max = 0 )
-    # Force cache size above limit but with empty recency queue
+def test_803_probe_cache_evict_within_limit( ):
+    ''' Count eviction leaves cache alone when within limit. '''
+    cache = module.ProbeCache( entries_max = 1 )
     cache._cache[ 'url1' ] = Mock( )
-    cache._recency.clear( )
-    # Should not crash when trying to evict from empty queue
     cache._evict_by_count( )
     assert len( cache._cache ) == 1  # Unchanged since nothing to evict
 
 
 def test_804_extract_charset_no_semicolon( ):
     ''' Content-Type without semicolon returns charset default. '''
-    headers = _httpx.Headers( { 'content-type': 'text/plain' } )
+    headers = _HEADERS_TEXT_PLAIN
     result = module._extract_charset_from_headers( headers, 'utf-8' )
     assert result == 'utf-8'  # Default returned when no semicolon
 
@@ -992,7 +1107,9 @@ def test_804_extract_charset_no_semicolon( ):
 
 
 @pytest.mark.asyncio
-async def test_900_probe_url_concurrent_requests_deduplication( robots_cache ):
+async def test_900_probe_url_concurrent_requests_deduplication(
+    robots_cache, mock_client_factory
+):
     ''' Concurrent probe requests for same URL are deduplicated. '''
     cache = module.ProbeCache( )
     url = Url(
@@ -1003,9 +1120,7 @@ async def test_900_probe_url_concurrent_requests_deduplication( robots_cache ):
         nonlocal call_count
         call_count += 1
         return _httpx.Response( 200 )
-    mock_transport = _httpx.MockTransport( handler )
-    def client_factory( ):
-        return _httpx.AsyncClient( transport = mock_transport )
+    client_factory = mock_client_factory( handler = handler )
     results = await asyncio.gather(
         module.probe_url(
             cache, url, client_factory = client_factory ),
@@ -1014,12 +1129,14 @@ async def test_900_probe_url_concurrent_requests_deduplication( robots_cache ):
         module.probe_url(
             cache, url, client_factory = client_factory ) )
     assert all( results )
-    # HTTP requests should be minimal due to deduplication (includes robots.txt check)
-    assert call_count <= 2  # Main request + possible robots.txt check
+    # Only one caller performs the requests
+    assert call_count == 2  # Main request + robots.txt check
 
 
 @pytest.mark.asyncio
-async def test_901_retrieve_url_concurrent_requests_deduplication( robots_cache ):
+async def test_901_retrieve_url_concurrent_requests_deduplication(
+    robots_cache, mock_client_factory
+):
     ''' Concurrent retrieve requests for same URL are deduplicated. '''
     cache = module.ContentCache( )
     url = Url(
@@ -1033,9 +1150,7 @@ async def test_901_retrieve_url_concurrent_requests_deduplication( robots_cache
         return _httpx.Response(
             200, content = test_content,
             headers = { 'content-type': 'text/plain' } )
-    mock_transport = _httpx.MockTransport( handler )
-    def client_factory( ):
-        return _httpx.AsyncClient( transport = mock_transport )
+    client_factory = mock_client_factory( handler = handler )
     results = await asyncio.gather(
         module.retrieve_url(
             cache, url, client_factory = client_factory ),
@@ -1045,36 +1160,182 @@ async def test_901_retrieve_url_concurrent_requests_deduplication( robots_cache
             cache, url, client_factory = client_factory ) )
     # All should return same content
     assert all( result == test_content for result in results )
-    # HTTP requests should be minimal due to deduplication (includes robots.txt check)
-    assert call_count <= 2  # Main request + possible robots.txt check
+    # Only one caller performs the requests
+    assert call_count == 2  # Main request + robots.txt check
 
 
 @pytest.mark.asyncio
-async def test_902_request_mutex_cleanup_after_completion( robots_cache ):
-    ''' Request mutexes are cleaned up after completion. '''
+async def test_902_inflight_requests_cleared_after_completion(
+    robots_cache, mock_client_factory
+):
+    ''' In-flight request records are cleared after completion. '''
     url = Url(
         scheme = 'http', netloc = 'example.com', path = '/test',
         params = '', query = '', fragment = '' )
-    url_key = url.geturl( )
     def handler( request ):
         return _httpx.Response( 200 )
-    mock_transport = _httpx.MockTransport( handler )
-    def client_factory( ):
-        return _httpx.AsyncClient( transport = mock_transport )
+    client_factory = mock_client_factory( handler = handler )
 
-    # Test probe cache mutex cleanup
+    # Test probe cache in-flight cleanup
     probe_cache = module.ProbeCache( )
     await module.probe_url(
         probe_cache, url, client_factory = client_factory )
-    # Mutex should be cleaned up after request completes
-    assert url_key not in probe_cache._request_mutexes
+    assert not probe_cache._requests_inflight
 
-    # Test content cache mutex cleanup
+    # Test content cache in-flight cleanup
     content_cache = module.ContentCache( )
     await module.retrieve_url(
         content_cache, url, client_factory = client_factory )
-    # Mutex should be cleaned up after request completes
-    assert url_key not in content_cache._request_mutexes
+    assert not content_cache._requests_inflight
+
+
+@pytest.mark.asyncio
+async def test_903_shared_request_failure_reaches_all_callers( ):
+    ''' Concurrent callers all receive failure of shared request. '''
+    cache = module.ProbeCache( )
+    release = asyncio.Event( )
+    call_count = 0
+    async def requestor( ):
+        nonlocal call_count
+        call_count += 1
+        await release.wait( )
+        raise ValueError( 'shared failure' )
+    tasks = [
+        asyncio.create_task( cache.share_request( 'key', requestor ) )
+        for _ in range( 3 ) ]
+    await asyncio.sleep( 0 )
+    release.set( )
+    leader, *followers = await asyncio.gather(
+        *tasks, return_exceptions = True )
+    assert call_count == 1
+    assert isinstance( leader, ValueError )
+    for follower in followers:
+        assert type( follower ) is ValueError
+        assert follower is not leader
+        assert follower.args == leader.args
+        assert follower.__cause__ is leader
+    assert followers[ 0 ] is not followers[ 1 ]
+    assert not cache._requests_inflight
+
+
+@pytest.mark.asyncio
+async def test_904_cancelled_shared_request_performed_by_waiters( ):
+    ''' Waiters perform request anew when shared request is cancelled. '''
+    cache = module.ProbeCache( )
+    started = asyncio.Event( )
+    call_count = 0
+    async def requestor( ):
+        nonlocal call_count
+        call_count += 1
+        if call_count == 1:
+            started.set( )
+            await asyncio.Event( ).wait( )
+        await asyncio.sleep( 0 )
+        return call_count
+    leader = asyncio.create_task( cache.share_request( 'key', requestor ) )
+    await started.wait( )
+    followers = [
+        asyncio.create_task( cache.share_request( 'key', requestor ) )
+        for _ in range( 2 ) ]
+    await asyncio.sleep( 0 )
+    leader.cancel( )
+    results = await asyncio.gather( *followers )
+    assert leader.cancelled( )
+    assert results == [ 2, 2 ]
+    assert call_count == 2
+    assert not cache._requests_inflight
+
+
+@pytest.mark.asyncio
+async def test_905_shared_request_failure_replicates_http_exception( ):
+    ''' Waiters replicate HTTP exceptions with required arguments. '''
+    cache = module.RobotsCache( )
+    release = asyncio.Event( )
+    request = _httpx.Request( 'GET', 'https://example.com/robots.txt' )
+    async def requestor( ):
+        await release.wait( )
+        raise _httpx.TimeoutException( 'Timeout', request = request )
+    tasks = [
+        asyncio.create_task(
+            cache.share_request( 'https://example.com', requestor ) )
+        for _ in range( 2 ) ]
+    await asyncio.sleep( 0 )
+    release.set( )
+    leader, follower = await asyncio.gather(
+        *tasks, return_exceptions = True )
+    assert type( follower ) is _httpx.TimeoutException
+    assert follower is not leader
+    assert follower.request is request
+    assert follower.__cause__ is leader
+
+
+@pytest.mark.asyncio
+async def test_910_shared_http_client_reused_until_closed( ):
+    ''' Default HTTP client is reused across requests until closed. '''
+    holder = module._HttpClientHolder( )
+    constructor = Mock( wraps = _httpx.AsyncClient )
+    with patch.object( _httpx, 'AsyncClient', constructor ):
+        client = holder.produce( )
+        assert holder.produce( ) is client
+    constructor.assert_called_once_with( limits = module._http_limits )
+    await holder.aclose( )
+    assert client.is_closed
+    replacement = holder.produce( )
+    assert replacement is not client
+    await holder.aclose( )
+
+
+@pytest.mark.asyncio
+async def test_911_default_http_client_closed_by_hook( ):
+    ''' Teardown hook closes HTTP client of default factory. '''
+    client = module._produce_http_client( )
+    await module.aclose_http_client( )
+    assert client.is_closed
+    assert module._http_client_holder.client is None
+    await module.aclose_http_client( )
+
+
+@pytest.mark.asyncio
+async def test_912_custom_factory_clients_closed_after_request(
+    probe_cache, mock_client_factory
+):
+    ''' Clients from custom factories are closed after each request. '''
+    produced: list[ _httpx.AsyncClient ] = [ ]
+    client_factory = mock_client_factory( status = 200 )
+    def tracking_factory( ):
+        client = client_factory( )
+        produced.append( client )
+        return client
+    assert await module.probe_url(
+        probe_cache, _URL_HTTP_TEST, client_factory = tracking_factory )
+    assert produced
+    assert all( client.is_closed for client in produced )
+
+
+@pytest.mark.asyncio
+async def test_913_replaced_http_client_closed_on_its_loop( ):
+    ''' Client of another running loop is closed there when replaced. '''
+    async def produce( holder ): return holder.produce( )
+    holder = module._HttpClientHolder( )
+    loop = asyncio.new_event_loop( )
+    thread = threading.Thread( target = loop.run_forever )
+    thread.start( )
+    try:
+        client = asyncio.run_coroutine_threadsafe(
+            produce( holder ), loop ).result( )
+        replacement = holder.produce( )
+        assert replacement is not client
+        for _ in range( 100 ):
+            if client.is_closed: break
+            await asyncio.sleep( 0.01 )
+        assert client.is_closed
+        assert not holder.owns( client )
+        assert holder.owns( replacement )
+    finally:
+        loop.call_soon_threadsafe( loop.stop )
+        thread.join( )
+        loop.close( )
+        await holder.aclose( )
 
 
 #
@@ -1083,7 +1344,7 @@ async def test_902_request_mutex_cleanup_after_completion( robots_cache ):
 
 
 @pytest.fixture
-def robots_cache( test_delay_fn ):
+def robots_cache( test_delay_fn, test_clock ):
     ''' Robots cache with test configuration. '''
     return module.RobotsCache(
         entries_max = 250,
@@ -1092,10 +1353,11 @@ def robots_cache( test_delay_fn ):
         user_agent = 'test-agent',
         error_ttl = 30.0,
         success_ttl = 300.0,
-        delay_function = test_delay_fn )
+        delay_function = test_delay_fn,
+        time_function = test_clock )
 
 
-@pytest.fixture
+@pytest.fixture( scope = 'module' )
 def robots_txt_samples( ):
     ''' Loads sample robots.txt content for testing. '''
     import pathlib
@@ -1170,15 +1432,17 @@ def test_400_robots_cache_initialization( test_delay_fn ):
 
 
 @pytest.mark.asyncio
-async def test_404_robots_cache_store_robots_parser( robots_cache ):
+async def test_404_robots_cache_store_robots_parser(
+    robots_cache, test_clock
+):
     ''' Storing robots parser creates cache entry correctly. '''
     from urllib.robotparser import RobotFileParser
     parser = RobotFileParser( )
     parser.set_url( 'https://example.com/robots.txt' )
     response = _generics.Value( parser )
     domain = 'https://example.com'
-    with patch.object( module.__.time, 'time', return_value = 1000.0 ):
-        await robots_cache.store( domain, response, 3600.0 )
+    test_clock.now = 1000.0
+    await robots_cache.store( domain, response, 3600.0 )
     assert domain in robots_cache._cache
     entry = robots_cache._cache[ domain ]
     assert entry.response == response
@@ -1186,21 +1450,23 @@ async def test_404_robots_cache_store_robots_parser( robots_cache ):
     assert entry.ttl == 3600.0
 
 
-def test_405_robots_cache_calculate_delay_remainder( robots_cache ):
+def test_405_robots_cache_calculate_delay_remainder(
+    robots_cache, test_clock
+):
     ''' Crawl delay remainder calculation works correctly. '''
     domain = 'https://example.com'
-    with patch.object( module.__.time, 'time', return_value = 1000.0 ):
-        robots_cache.assign_delay( domain, 5.0 )
-    with patch.object( module.__.time, 'time', return_value = 1003.0 ):
-        remainder = robots_cache.calculate_delay_remainder( domain )
+    test_clock.now = 1000.0
+    robots_cache.assign_delay( domain, 5.0 )
+    test_clock.now = 1003.0
+    remainder = robots_cache.calculate_delay_remainder( domain )
     assert remainder == 2.0
 
 
-def test_406_robots_cache_assign_delay( robots_cache ):
+def test_406_robots_cache_assign_delay( robots_cache, test_clock ):
     ''' Setting crawl delay updates delay timestamp correctly. '''
     domain = 'https://example.com'
-    with patch.object( module.__.time, 'time', return_value = 1000.0 ):
-        robots_cache.assign_delay( domain, 10.0 )
+    test_clock.now = 1000.0
+    robots_cache.assign_delay( domain, 10.0 )
     expected_time = 1000.0 + 10.0
     assert robots_cache._request_delays[ domain ] == expected_time
 
@@ -1208,16 +1474,13 @@ def test_406_robots_cache_assign_delay( robots_cache ):
 @pytest.mark.asyncio
 async def test_407_robots_cache_eviction_by_count( test_delay_fn ):
     ''' LRU eviction works when cache exceeds max entries. '''
-    cache = module.RobotsCache(
-        entries_max = 2, delay_function = test_delay_fn )
+    cache = module.RobotsCache( entries_max = 2, delay_function = test_delay_fn )
     from urllib.robotparser import RobotFileParser
+    response = _generics.Value( RobotFileParser( ) )
     # Store 3 entries to trigger eviction
     for i in range( 3 ):
-        parser = RobotFileParser( )
-        response = _generics.Value( parser )
         domain = f'https://example{i}.com'
-        with patch.object( module.__.time, 'time', return_value = 1000.0 + i ):
-            await cache.store( domain, response, 3600.0 )
+        await cache.store( domain, response, 3600.0 )
     assert len( cache._cache ) == 2
     assert 'https://example1.com' in cache._cache
     assert 'https://example2.com' in cache._cache
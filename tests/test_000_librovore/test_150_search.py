@@ -0,0 +1,91 @@
+# vim: set filetype=python fileencoding=utf-8:
+# -*- coding: utf-8 -*-
+
+#============================================================================#
+#                                                                            #
+#  Licensed under the Apache License, Version 2.0 (the "License");           #
+#  you may not use this file except in compliance with the License.          #
+#  You may obtain a copy of the License at                                   #
+#                                                                            #
+#      http://www.apache.org/licenses/LICENSE-2.0                            #
+#                                                                            #
+#  Unless required by applicable law or agreed to in writing, software       #
+#  distributed under the License is distributed on an "AS IS" BASIS,         #
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  #
+#  See the License for the specific language governing permissions and       #
+#  limitations under the License.                                            #
+#                                                                            #
+#============================================================================#
+
+
+''' Search engine tests. '''
+
+
+import pytest
+import rapidfuzz
+
+import librovore.search as module
+
+from librovore import interfaces as _interfaces
+from librovore.inventories.sphinx import detection as _detection
+
+
+_NAMES = (
+    'librovore', 'librovore.search', 'Search', 'search', 'SearchResult',
+    'Search-Result', 'research', 'seach', '_search_private',
+    'filter_by_name', 'search.filter_by_name', 'unrelated', 'S.E.A.R.C.H',
+)
+_OBJECTS = tuple(
+    _detection.SphinxInventoryObject(
+        name = name, uri = f"api.html#{name}",
+        inventory_type = 'sphinx',
+        location_url = 'https://example.com/objects.inv' )
+    for name in _NAMES )
+
+
+def _filter_by_name_per_object(
+    term: str, search_behaviors: _interfaces.SearchBehaviors
+) -> list[ tuple[ str, float, str ] ]:
+    ''' Scores objects one at a time, as before batched scoring. '''
+    case_sensitive = search_behaviors.case_sensitive
+    term_compare = term if case_sensitive else term.lower( )
+    exact = search_behaviors.match_mode is _interfaces.MatchMode.Exact
+    results: list[ tuple[ str, float, str ] ] = [ ]
+    for obj in _OBJECTS:
+        name = obj.name if case_sensitive else obj.name.lower( )
+        if name == term_compare:
+            results.append( ( obj.name, 1.0, 'exact match' ) )
+            continue
+        if not search_behaviors.contains_term: continue
+        partial = rapidfuzz.fuzz.partial_ratio( term_compare, name )
+        if exact:
+            if partial < module._EXACT_THRESHOLD_MIN: continue
+            reason = f'partial match ({partial}%)'
+            results.append( ( obj.name, partial / 100.0, reason ) )
+            continue
+        regular = rapidfuzz.fuzz.ratio( term_compare, name )
+        ratio = max( partial, regular )
+        if ratio < search_behaviors.similarity_score_min: continue
+        kind = 'partial' if partial > regular else 'similar'
+        reason = f'{kind} match ({ratio}%)'
+        results.append( ( obj.name, ratio / 100.0, reason ) )
+    return sorted( results, key = lambda r: r[ 1 ], reverse = True )
+
+
+@pytest.mark.parametrize( 'match_mode', (
+    _interfaces.MatchMode.Exact, _interfaces.MatchMode.Similar ) )
+@pytest.mark.parametrize( 'case_sensitive', ( False, True ) )
+@pytest.mark.parametrize( 'term', ( 'search', 'Search', 'S.E.A.R.C.H' ) )
+def test_100_batched_scores_match_per_object_scores(
+    match_mode, case_sensitive, term
+):
+    ''' Batched name scoring yields same matches and scores as before. '''
+    search_behaviors = _interfaces.SearchBehaviors(
+        match_mode = match_mode, case_sensitive = case_sensitive )
+    results = module.filter_by_name(
+        _OBJECTS, term, search_behaviors = search_behaviors )
+    assert [
+        ( result.inventory_object.name, result.score,
+          result.match_reasons[ 0 ] )
+        for result in results
+    ] == _filter_by_name_per_object( term, search_behaviors )
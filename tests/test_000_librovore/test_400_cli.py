@@ -29,7 +29,7 @@ import pytest
 import librovore.cli as module
 import librovore.state as state_module
 
-# from .fixtures import run_cli_command, get_test_inventory_path
+from .fixtures import run_cli_command, run_cli_command_inprocess
 
 
 class MockDisplayOptions:
@@ -51,6 +51,21 @@ def create_test_auxdata( display_options = None ):
     return auxdata
 
 
+@pytest.fixture( scope = 'module' )
+def auxdata( ):
+    ''' Fixture providing mock auxdata with captured display stream.
+
+        Shared across module, since tests only pass it through.
+    '''
+    return create_test_auxdata( )
+
+
+@pytest.fixture
+def mock_serve( ):
+    ''' Fixture providing fresh serve function double. '''
+    return AsyncMock( )
+
+
 # @pytest.mark.asyncio
 # @pytest.mark.asyncio
 # async def test_060_use_command_summarize_delegation( ):
@@ -71,41 +86,20 @@ def create_test_auxdata( display_options = None ):
 #     assert 'py' in output
 # 
 # 
+@pytest.mark.parametrize( 'arguments, expected', (
+    ( { 'port': 8080, 'transport': 'stdio' },
+      { 'port': 8080, 'transport': 'stdio', 'extra_functions': False } ),
+    ( { }, { 'extra_functions': False } ),
+    ( { 'extra_functions': True }, { 'extra_functions': True } ),
+) )
 @pytest.mark.asyncio
-async def test_070_serve_command_unit( ):
-    ''' ServeCommand processes arguments correctly. '''
-    display = MockDisplayOptions( )
-    auxdata = create_test_auxdata( display )
-    mock_serve = AsyncMock( )
-    cmd = module.ServeCommand(
-        port = 8080, transport = 'stdio', serve_function = mock_serve
-    )
-    await cmd( auxdata )
-    mock_serve.assert_called_once_with(
-        auxdata, port = 8080, transport = 'stdio', extra_functions = False )
-
-
-@pytest.mark.asyncio
-async def test_080_serve_command_defaults( ):
-    ''' ServeCommand works with default arguments. '''
-    display = MockDisplayOptions( )
-    auxdata = create_test_auxdata( display )
-    mock_serve = AsyncMock( )
-    cmd = module.ServeCommand( serve_function = mock_serve )
+async def test_070_serve_command_unit(
+    auxdata, mock_serve, arguments, expected
+):
+    ''' ServeCommand passes arguments and defaults to serve function. '''
+    cmd = module.ServeCommand( serve_function = mock_serve, **arguments )
     await cmd( auxdata )
-    mock_serve.assert_called_once_with( auxdata, extra_functions = False )
-
-
-@pytest.mark.asyncio
-async def test_085_serve_command_extra_functions( ):
-    ''' ServeCommand passes extra_functions flag correctly. '''
-    display = MockDisplayOptions( )
-    auxdata = create_test_auxdata( display )
-    mock_serve = AsyncMock( )
-    cmd = module.ServeCommand(
-        extra_functions = True, serve_function = mock_serve )
-    await cmd( auxdata )
-    mock_serve.assert_called_once_with( auxdata, extra_functions = True )
+    mock_serve.assert_called_once_with( auxdata, **expected )
 
 
 # def test_090_cli_prepare_invocation_args( ):
@@ -137,50 +131,52 @@ async def test_085_serve_command_extra_functions( ):
 #     assert 'documents' in result.stdout or 'documents' in result.stderr
 
 
+def test_700_cli_serve_help( ):
+    ''' CLI serve command shows help information. '''
+    result = run_cli_command_inprocess( [ 'serve', '--help' ] )
+    assert result.returncode == 0
+    assert 'serve' in result.stdout.lower( )
+    assert 'transport' in result.stdout.lower( )
+    assert 'port' in result.stdout.lower( )
 
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_700_cli_serve_help( ):
-#     ''' CLI serve command shows help information. '''
-#     result = await run_cli_command( [ 'serve', '--help' ] )
-#     assert result.returncode == 0
-#     assert 'serve' in result.stdout.lower( )
-#     assert 'transport' in result.stdout.lower( )
-#     assert 'port' in result.stdout.lower( )
 
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_710_cli_serve_invalid_transport( ):
+    ''' CLI serve command fails with invalid transport. '''
+    # Transport is validated by serve, so this runs past argument parsing.
+    result = await run_cli_command( [ 'serve', '--transport', 'invalid' ] )
+    assert result.returncode != 0
 
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_710_cli_serve_invalid_transport( ):
-#     ''' CLI serve command fails with invalid transport. '''
-#     result = await run_cli_command( [ 'serve', '--transport', 'invalid' ] )
-#     assert result.returncode != 0
 
+def test_720_cli_serve_invalid_port( ):
+    ''' CLI serve command rejects invalid port during argument parsing. '''
+    result = run_cli_command_inprocess( [ 'serve', '--port', 'invalid' ] )
+    assert result.returncode == 2
+    assert 'error parsing --port' in result.stderr.lower( )
 
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_720_cli_serve_invalid_port( ):
-#     ''' CLI serve command fails with invalid port. '''
-#     result = await run_cli_command( [ 'serve', '--port', 'invalid' ] )
-#     assert result.returncode != 0
 
+def test_800_cli_main_help( ):
+    ''' CLI main command shows help information. '''
+    result = run_cli_command_inprocess( [ '--help' ] )
+    assert result.returncode == 0
+    assert 'librovore' in result.stdout.lower( )
+    assert 'command' in result.stdout.lower( )
 
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_800_cli_main_help( ):
-#     ''' CLI main command shows help information. '''
-#     result = await run_cli_command( [ '--help' ] )
-#     assert result.returncode == 0
-#     assert 'librovore' in result.stdout.lower( )
-#     assert 'command' in result.stdout.lower( )
 
+def test_810_cli_invalid_command( ):
+    ''' CLI fails gracefully with invalid command. '''
+    result = run_cli_command_inprocess( [ 'invalid-command' ] )
+    assert result.returncode != 0
+    assert (
+            'error' in result.stderr.lower( )
+        or 'invalid' in result.stderr.lower( ) )
 
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_810_cli_invalid_command( ):
-#     ''' CLI fails gracefully with invalid command. '''
-#     result = await run_cli_command( [ 'invalid-command' ] )
-#     assert result.returncode != 0
-#     assert (
-#             'error' in result.stderr.lower( )
-#         or 'invalid' in result.stderr.lower( ) )
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_900_cli_entrypoint_subprocess( ):
+    ''' CLI runs as module entrypoint in separate interpreter. '''
+    result = await run_cli_command( [ '--help' ] )
+    assert result.returncode == 0
+    assert 'librovore' in result.stdout.lower( )
@@ -25,6 +25,7 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+import librovore.cacheproxy as _cacheproxy
 import librovore.server as module
 import librovore.state as _state
 
@@ -124,3 +125,13 @@ async def test_230_serve_default_transport( ):
         try: await module.serve( mock_auxdata )
         except ValueError:
             pytest.fail( "ValueError raised for default transport" )
+
+
+@pytest.mark.asyncio
+async def test_240_serve_closes_http_client( ):
+    ''' Serve function closes shared HTTP client on shutdown. '''
+    mock_auxdata = Mock( )
+    client = _cacheproxy._produce_http_client( )
+    with pytest.raises( ValueError ):
+        await module.serve( mock_auxdata, transport = 'invalid' )
+    assert client.is_closed
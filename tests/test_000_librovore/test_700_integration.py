@@ -18,156 +18,35 @@
 #============================================================================#
 
 
-''' Full MCP protocol integration tests using SSE transport. '''
+''' Full MCP protocol integration tests using stdio transport. '''
 
 
-# import pytest
+import pytest
 
-# from .fixtures import (
-#     MCPTestClient, get_test_inventory_path, mcp_test_server )
+from .fixtures import MCPTestClient, mcp_test_server, mock_inventory_bytes
 
 
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_000_mcp_server_startup_and_initialization( ):
-#     ''' MCP server starts and completes initialization handshake. '''
-#     async with (
-#         mcp_test_server( ) as port,
-#         MCPTestClient( port ) as client
-#     ):
-#         response = await client.initialize( )
-#         assert response[ 'jsonrpc' ] == '2.0'
-#         assert 'result' in response
-#         assert 'serverInfo' in response[ 'result' ]
-#         assert (
-#             response[ 'result' ][ 'serverInfo' ][ 'name' ] ==
-#             'Sphinx MCP Server'
-#         )
-
-
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_010_mcp_tools_list( ):
-#     ''' MCP server provides expected tools list. '''
-#     async with (
-#         mcp_test_server( ) as port,
-#         MCPTestClient( port ) as client
-#     ):
-#         await client.initialize( )
-#         response = await client.list_tools( )
-#         assert response[ 'jsonrpc' ] == '2.0'
-#         assert 'result' in response
-#         assert 'tools' in response[ 'result' ]
-#         tools = response[ 'result' ][ 'tools' ]
-#         tool_names = [ tool[ 'name' ] for tool in tools ]
-#         assert 'summarize_inventory' in tool_names
-#         assert 'query_documentation' in tool_names
-#         assert 'explore' in tool_names
-
-
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_170_mcp_explore_tool( ):
-#     ''' MCP explore tool processes inventory files and docs. '''
-#     inventory_path = get_test_inventory_path( 'librovore' )
-#     async with (
-#         mcp_test_server( ) as port,
-#         MCPTestClient( port ) as client
-#     ):
-#         await client.initialize( )
-#         response = await client.call_tool( 'explore', {
-#             'source': inventory_path,
-#             'query': 'test',
-#             'include_documentation': False
-#         } )
-#         assert response[ 'jsonrpc' ] == '2.0'
-#         assert 'result' in response
-#         content = response[ 'result' ][ 'content' ]
-#         assert len( content ) > 0
-#         assert content[ 0 ][ 'type' ] == 'text'
-#         text_content = content[ 0 ][ 'text' ]
-#         assert 'project' in text_content
-#         assert 'documents' in text_content
-
-
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_180_mcp_explore_nonexistent_file( ):
-#     ''' MCP explore tool handles nonexistent files gracefully. '''
-#     async with (
-#         mcp_test_server( ) as port,
-#         MCPTestClient( port ) as client
-#     ):
-#         await client.initialize( )
-#         response = await client.call_tool( 'explore', {
-#             'source': '/nonexistent/path.inv',
-#             'query': 'test'
-#         } )
-#         assert response[ 'jsonrpc' ] == '2.0'
-#         assert 'result' in response
-#         assert 'isError' in response[ 'result' ]
-#         assert response[ 'result' ][ 'isError' ]
-
-
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_300_mcp_invalid_tool_name( ):
-#     ''' MCP server handles invalid tool names gracefully. '''
-#     async with (
-#         mcp_test_server( ) as port,
-#         MCPTestClient( port ) as client
-#     ):
-#         await client.initialize( )
-#         response = await client.call_tool( 'nonexistent_tool', { } )
-#         assert response[ 'jsonrpc' ] == '2.0'
-#         assert 'result' in response
-#         assert 'isError' in response[ 'result' ]
-#         assert response[ 'result' ][ 'isError' ]
-
-
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_310_mcp_protocol_error_handling( ):
-#     ''' MCP server handles malformed requests gracefully. '''
-#     async with (
-#         mcp_test_server( ) as port,
-#         MCPTestClient( port ) as client
-#     ):
-#         await client.initialize( )
-#         malformed_request = {
-#             "jsonrpc": "2.0",
-#             "method": "tools/call",
-#             # Missing required params
-#             "id": 1
-#         }
-#         response = await client.send_request( malformed_request )
-#         assert response[ 'jsonrpc' ] == '2.0'
-#         assert 'error' in response
-#         assert response[ 'id' ] == 1
-
-
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_400_mcp_stdio_transport( ):
-#     ''' stdio transport works correctly with MCP protocol. '''
-#     async with (
-#         mcp_test_server( ) as process,
-#         MCPTestClient( process ) as client
-#     ):
-#         assert client.process == process
-#         response = await client.initialize( )
-#         assert response[ 'jsonrpc' ] == '2.0'
-#         assert 'result' in response
-#         inventory_path = get_test_inventory_path( 'librovore' )
-#         response = await client.call_tool(
-#             'summarize_inventory', { 'source': inventory_path } )
-#         assert response[ 'jsonrpc' ] == '2.0'
-#         assert 'result' in response
-#         content = response[ 'result' ][ 'content' ]
-#         assert 'Project:' in content[ 0 ][ 'text' ]
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_400_mcp_stdio_transport( tmp_path ):
+    ''' stdio transport works correctly with MCP protocol. '''
+    ( tmp_path / 'objects.inv' ).write_bytes( mock_inventory_bytes( ) )
+    async with (
+        mcp_test_server( ) as process,
+        MCPTestClient( process ) as client
+    ):
+        response = await client.initialize( )
+        assert response[ 'jsonrpc' ] == '2.0'
+        assert 'result' in response
+        response = await client.list_tools( )
+        names = { tool[ 'name' ] for tool in response[ 'result' ][ 'tools' ] }
+        assert { 'query_inventory', 'query_content' } <= names
+        response = await client.call_tool(
+            'query_inventory',
+            { 'location': str( tmp_path ), 'term': 'query_inventory' } )
+        assert response[ 'id' ] == client.request_id
+        content = response[ 'result' ][ 'content' ]
+        assert 'librovore.functions.query_inventory' in content[ 0 ][ 'text' ]
 
 
 # @pytest.mark.slow
@@ -195,20 +74,3 @@
 #         assert (
 #             'project' in
 #             response2[ 'result' ][ 'content' ][ 0 ][ 'text' ] )
-
-
-# @pytest.mark.slow
-# @pytest.mark.asyncio
-# async def test_500_mcp_server_shutdown_cleanup( ):
-#     ''' MCP server shuts down cleanly and cleans up resources. '''
-#     async with (
-#         mcp_test_server( ) as port,
-#         MCPTestClient( port ) as client
-#     ):
-#         await client.initialize( )
-#         inventory_path = get_test_inventory_path( 'librovore' )
-#         response = await client.call_tool(
-#             'summarize_inventory', { 'source': inventory_path } )
-#         assert (
-#             'Project:' in
-#             response[ 'result' ][ 'content' ][ 0 ][ 'text' ] )
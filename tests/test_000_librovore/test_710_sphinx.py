@@ -21,6 +21,14 @@
 ''' Sphinx processor implementation tests using dependency injection. '''
 
 
+import os
+
+from librovore import __
+from librovore.inventories.sphinx import detection
+
+from .fixtures import mock_inventory_bytes
+
+
 # import librovore.structures.sphinx.urls as module
 
 
@@ -29,3 +37,45 @@
 #     test_path = '/home/user/test.inv'
 #     result = module.normalize_base_url( test_path )
 #     assert result.geturl( ) == 'file:///home/user'
+
+
+def _write_test_inventory( location: __.Path ) -> __.Path:
+    ''' Writes test inventory into location. '''
+    inventory_path = location / 'objects.inv'
+    inventory_path.write_bytes( mock_inventory_bytes( ) )
+    return inventory_path
+
+
+def test_200_extract_inventory_reuses_unchanged_file( tmp_path ):
+    ''' Unchanged inventory file is parsed only once. '''
+    _write_test_inventory( tmp_path )
+    base_url = __.urlparse.urlparse( tmp_path.as_uri( ) )
+    inventory = detection.extract_inventory( base_url )
+    assert detection.extract_inventory( base_url ) is inventory
+
+
+def test_210_extract_inventory_reparses_modified_file( tmp_path ):
+    ''' Inventory file is parsed again after modification. '''
+    inventory_path = _write_test_inventory( tmp_path )
+    base_url = __.urlparse.urlparse( tmp_path.as_uri( ) )
+    inventory = detection.extract_inventory( base_url )
+    mtime_ns = inventory_path.stat( ).st_mtime_ns + 1_000_000_000
+    os.utime( inventory_path, ns = ( mtime_ns, mtime_ns ) )
+    reparsed = detection.extract_inventory( base_url )
+    assert reparsed is not inventory
+    assert reparsed.count == inventory.count
+
+
+def test_220_extract_inventory_reparses_same_tick_rewrite( tmp_path ):
+    ''' Rewrite within one timestamp tick is detected by size change. '''
+    inventory_path = _write_test_inventory( tmp_path )
+    base_url = __.urlparse.urlparse( tmp_path.as_uri( ) )
+    inventory = detection.extract_inventory( base_url )
+    status = inventory_path.stat( )
+    inventory_path.write_bytes( mock_inventory_bytes( ).replace(
+        b'# Version: 1.0\n', b'# Version: 1.10\n' ) )
+    os.utime(
+        inventory_path, ns = ( status.st_atime_ns, status.st_mtime_ns ) )
+    reparsed = detection.extract_inventory( base_url )
+    assert reparsed is not inventory
+    assert reparsed.version == '1.10'